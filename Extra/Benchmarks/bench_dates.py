@@ -0,0 +1,95 @@
+import os
+import re
+import sys
+import time
+
+# Ejecutar desde la raíz del proyecto:
+#   python Extra/Benchmarks/bench_dates.py "<game_root>/history/characters" [offset]
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from core.dates import shift_file_data
+from utils.file_ops import decode_text
+
+
+# ---------------------------------------------------------
+# Implementación anterior (re.sub + closure con f-string)
+# ---------------------------------------------------------
+def legacy_apply_offset(data, offset):
+    text = decode_text(data)
+
+    pattern = r"\b(\d{3,4})\.(\d{1,2})\.(\d{1,2})\b"
+
+    changes = 0
+
+    def repl(match):
+        nonlocal changes
+        year = int(match.group(1)) + offset
+        month = match.group(2)
+        day = match.group(3)
+        new = f"{year}.{month}.{day}"
+        if new != match.group(0):
+            changes += 1
+        return new
+
+    processed = re.sub(pattern, repl, text)
+
+    return processed, changes
+
+
+# ---------------------------------------------------------
+# Leer todos los .txt/.yml de la carpeta en memoria
+# ---------------------------------------------------------
+def load_files(folder):
+    blobs = []
+    for base, _, files in os.walk(folder):
+        for f in files:
+            if os.path.splitext(f)[1].lower() in (".txt", ".yml"):
+                with open(os.path.join(base, f), "rb") as fh:
+                    blobs.append(fh.read())
+    return blobs
+
+
+def bench(name, func, blobs, offset, rounds=3):
+    total = sum(len(b) for b in blobs)
+    best = None
+    dates = 0
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        dates = 0
+        for data in blobs:
+            dates += func(data, offset)[1]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"{name:<10} {best:8.3f} s   {total / best / 1e6:8.1f} MB/s   {dates} fechas")
+    return best
+
+
+def main():
+    if len(sys.argv) < 2 or not os.path.isdir(sys.argv[1]):
+        print("Uso: bench_dates.py <carpeta history/characters> [offset]")
+        return
+
+    offset = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    blobs = load_files(sys.argv[1])
+    print(f"{len(blobs)} archivos, {sum(len(b) for b in blobs) / 1e6:.1f} MB, offset {offset}")
+
+    # Mismo resultado en ambos motores
+    for data in blobs:
+        old_text, old_changes = legacy_apply_offset(data, offset)
+        new_text, new_changes = shift_file_data(data, offset)
+        if isinstance(new_text, bytes):
+            new_text = new_text.decode("ascii")
+        if (old_text, old_changes) != (new_text, new_changes):
+            print("ERROR: los resultados no coinciden")
+            return
+
+    t_old = bench("anterior", legacy_apply_offset, blobs, offset)
+    t_new = bench("nuevo", shift_file_data, blobs, offset)
+    print(f"Mejora: x{t_old / t_new:.2f}")
+
+
+if __name__ == "__main__":
+    main()
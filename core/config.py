@@ -0,0 +1,99 @@
+import os
+import copy
+import json
+import threading
+
+
+# ---------------------------------------------------------
+# Configuración compartida (data/modules.json, data/files.json)
+# ---------------------------------------------------------
+# Cada archivo se lee una vez y se guarda en caché junto a su (tamaño, mtime).
+# get() solo vuelve a leer si el archivo ha cambiado en disco. save() escribe,
+# actualiza la caché y avisa a los suscriptores, así que las ediciones desde la
+# propia aplicación nunca provocan una relectura.
+#
+# get() y los avisos entregan copias: editar lo recibido no cambia la caché
+# hasta que save() termina bien. Los avisos llegan en el hilo que hizo get()
+# o save(); los suscriptores de la GUI deben pasarlos a su hilo.
+
+MODULES_PATH = os.path.join("data", "modules.json")
+FILES_PATH = os.path.join("data", "files.json")
+
+
+class ConfigFile:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = None
+        self._stamp = None          # (tamaño, mtime_ns) de lo que hay en caché
+        self._listeners = []
+
+    def _disk_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    # ------------------------------
+    # Datos (releídos solo si cambió el archivo)
+    # ------------------------------
+    def get(self):
+        with self._lock:
+            stamp = self._disk_stamp()
+            if self._data is not None and stamp == self._stamp:
+                return copy.deepcopy(self._data)
+
+            if stamp is None:
+                data = {}
+            else:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+
+            reloaded = self._data is not None
+            self._data = data
+            self._stamp = stamp
+
+        if reloaded:
+            self._notify(data)
+        return copy.deepcopy(data)
+
+    # ------------------------------
+    # Guardar y avisar
+    # ------------------------------
+    def save(self, data):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=4)
+                os.replace(tmp, self.path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+            data = copy.deepcopy(data)
+            self._data = data
+            self._stamp = self._disk_stamp()
+
+        self._notify(data)
+
+    # ------------------------------
+    # Suscripción a cambios: callback(data)
+    # ------------------------------
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, data):
+        for callback in list(self._listeners):
+            callback(copy.deepcopy(data))
+
+
+modules_config = ConfigFile(MODULES_PATH)
+files_config = ConfigFile(FILES_PATH)
@@ -0,0 +1,253 @@
+import os
+import re
+import codecs
+import hashlib
+
+from utils.file_ops import decode_text
+
+
+# ---------------------------------------------------------
+# Motor de desplazamiento de fechas (867.1.1, 1066.9.15, ...)
+# ---------------------------------------------------------
+# El patrón se compila una sola vez. Hay variante str y bytes:
+# - str: \d y \b Unicode, igual que el re.sub original
+# - bytes: \d y \b ASCII; solo se usa con archivos 100% ASCII, donde
+#   ambas variantes encuentran exactamente las mismas fechas
+
+DATE_PATTERN = re.compile(r"\b(\d{3,4})\.(\d{1,2})\.(\d{1,2})\b")
+DATE_PATTERN_BYTES = re.compile(rb"\b(\d{3,4})\.(\d{1,2})\.(\d{1,2})\b")
+
+# Prefiltro: toda fecha contiene "3 dígitos.dígito" (un search sin grupos ni
+# callback; casi todos los scripts tienen algún "." o decimales, no fechas)
+DATE_HINT = re.compile(r"\d{3}\.\d")
+DATE_HINT_BYTES = re.compile(rb"\d{3}\.\d")
+
+
+# ---------------------------------------------------------
+# Año original → año desplazado, calculado una vez por año distinto
+# ---------------------------------------------------------
+class _YearMemo(dict):
+    def __init__(self, offset, as_bytes):
+        super().__init__()
+        self.offset = offset
+        self.as_bytes = as_bytes
+
+    def __missing__(self, year):
+        new = str(int(year) + self.offset)
+        if self.as_bytes:
+            new = new.encode("ascii")
+        self[year] = new
+        return new
+
+
+_memos = {}     # (offset, bytes?) → _YearMemo (uno por proceso)
+
+
+def _year_memo(offset, as_bytes):
+    memo = _memos.get((offset, as_bytes))
+    if memo is None:
+        memo = _memos[(offset, as_bytes)] = _YearMemo(offset, as_bytes)
+    return memo
+
+
+# ---------------------------------------------------------
+# Desplazar fechas en un texto (str o bytes)
+# ---------------------------------------------------------
+def shift_dates(text, offset):
+    """
+    Suma offset al año de cada fecha.
+    Devuelve (texto procesado, nº de fechas que realmente cambian).
+    """
+    as_bytes = isinstance(text, bytes)
+
+    # Prefiltro: sin "3 dígitos.dígito" no puede haber fechas
+    if not (DATE_HINT_BYTES if as_bytes else DATE_HINT).search(text):
+        return text, 0
+
+    pattern = DATE_PATTERN_BYTES if as_bytes else DATE_PATTERN
+    memo = _year_memo(offset, as_bytes)
+
+    # Solo cambia el año: el resto de la fecha se copia tal cual
+    def repl(m):
+        year = m.group(1)
+        return memo[year] + m.group(0)[len(year):]
+
+    processed, matches = pattern.subn(repl, text)
+
+    if offset:
+        # Con offset distinto de 0 todas las fechas cambian
+        return processed, matches
+
+    # offset 0: solo cambian los años no canónicos ("0867" → "867")
+    changes = sum(1 for m in pattern.finditer(text) if memo[m.group(1)] != m.group(1))
+    return processed, changes
+
+
+# ---------------------------------------------------------
+# Desplazar fechas en el contenido binario de un archivo
+# ---------------------------------------------------------
+def shift_file_data(data, offset):
+    """
+    data: bytes leídos del archivo.
+    - Archivos ASCII → se procesan como bytes, sin decodificar
+    - Resto → UTF-8 con fallback Latin-1 (decode_text)
+    Los saltos de línea quedan normalizados a "\\n", como en modo texto.
+    Devuelve (str o bytes procesados, nº de fechas que cambian).
+    """
+    if data.isascii():
+        if b"\r" in data:
+            data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        return shift_dates(data, offset)
+
+    return shift_dates(decode_text(data), offset)
+
+
+# ---------------------------------------------------------
+# Bytes a escribir en el mod (igual que open(..., "w", encoding="utf-8"))
+# ---------------------------------------------------------
+def encode_output(processed):
+    if isinstance(processed, bytes):
+        if os.linesep != "\n":
+            processed = processed.replace(b"\n", os.linesep.encode("ascii"))
+        return processed
+
+    if os.linesep != "\n":
+        processed = processed.replace("\n", os.linesep)
+    return processed.encode("utf-8")
+
+
+# ---------------------------------------------------------
+# Modo streaming para archivos grandes (memoria constante)
+# ---------------------------------------------------------
+# Se lee por bloques y se procesa hasta el último "\n" de cada bloque: una
+# fecha nunca cruza un salto de línea, así que el resultado es el mismo que
+# procesando el archivo entero.
+# Si la última línea pasa de un bloque (o no hay saltos) se corta tras el
+# último carácter que no es de palabra ni ".": una fecha no puede contenerlo
+# y los \b a ambos lados del corte se evalúan igual que en el texto entero.
+
+STREAM_CHUNK_SIZE = 1 << 20
+
+_SAFE_CUT = re.compile(r"[^\w.][\w.]*\Z")
+
+
+def _iter_shifted(path, offset, encoding, chunk_size, digest=None):
+    """
+    Genera (trozo procesado, nº de cambios) leyendo path por bloques.
+    Con encoding="utf-8" lanza UnicodeDecodeError si el archivo no lo es.
+    digest (hashlib): se actualiza con los bytes leídos.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    carry = ""
+
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            final = not chunk
+
+            if digest is not None:
+                digest.update(chunk)
+
+            text = carry + decoder.decode(chunk, final)
+
+            # Un "\r" al final puede ser la mitad de un "\r\n"
+            held = ""
+            if not final and text.endswith("\r"):
+                text, held = text[:-1], "\r"
+
+            if "\r" in text:
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+            if final:
+                if text:
+                    yield shift_dates(text, offset)
+                return
+
+            cut = text.rfind("\n") + 1
+            if len(text) - cut > chunk_size:
+                m = _SAFE_CUT.search(text, cut)
+                if m:
+                    cut = m.start() + 1
+            carry = text[cut:] + held
+
+            if cut:
+                yield shift_dates(text[:cut], offset)
+
+
+def measure_file_stream(src, offset, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Como shift_file_stream pero sin escribir nada.
+    Devuelve (nº de fechas que cambian, bytes que se escribirían en el mod).
+    """
+    encoding = "utf-8"
+
+    while True:
+        changes = 0
+        out_bytes = 0
+
+        try:
+            for piece, c in _iter_shifted(src, offset, encoding, chunk_size):
+                changes += c
+                out_bytes += len(encode_output(piece))
+            break
+        except UnicodeDecodeError:
+            encoding = "latin-1"
+
+    return changes, (out_bytes if changes else 0)
+
+
+def shift_file_stream(src, dst, offset, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Igual que shift_file_data + encode_output, pero por bloques:
+    - Solo se escribe dst si alguna fecha cambia (no se crean carpetas vacías)
+    - Se escribe en un temporal que se renombra de forma atómica
+    - UTF-8 con fallback Latin-1: si UTF-8 falla se vuelve a empezar
+    - El md5 del origen se calcula en la pasada que lo lee entero
+    Devuelve (nº de fechas que cambian, md5 de la salida o None, md5 del origen).
+    """
+    encoding = "utf-8"
+
+    # Pasada de lectura: ¿cambia alguna fecha? Se corta en la primera
+    while True:
+        src_digest = hashlib.md5()
+        try:
+            changed = any(c for _, c in _iter_shifted(src, offset, encoding, chunk_size, src_digest))
+            break
+        except UnicodeDecodeError:
+            encoding = "latin-1"
+
+    if not changed:
+        # any() ha leído el archivo entero: la codificación ya es la definitiva
+        return 0, None, src_digest.hexdigest()
+
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.tmp"
+
+    try:
+        while True:
+            changes = 0
+            digest = hashlib.md5()
+            src_digest = hashlib.md5()
+
+            try:
+                with open(tmp, "wb") as out:
+                    for piece, c in _iter_shifted(src, offset, encoding, chunk_size, src_digest):
+                        changes += c
+                        data = encode_output(piece)
+                        digest.update(data)
+                        out.write(data)
+                break
+            except UnicodeDecodeError:
+                encoding = "latin-1"
+
+        # UTF-8 falló después del primer cambio: con Latin-1 puede no haber ninguno
+        if not changes:
+            return 0, None, src_digest.hexdigest()
+
+        os.replace(tmp, dst)
+
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    return changes, digest.hexdigest(), src_digest.hexdigest()
@@ -1,7 +1,8 @@
 import os
-import shutil
 import re
 
+from utils.file_ops import copy_if_changed
+
 
 # ---------------------------------------------------------
 # Leer END_DATE del juego
@@ -85,8 +86,8 @@ def write_end_date(game_root, mod_root, backup_root, new_date):
     os.makedirs(os.path.dirname(dst_mod), exist_ok=True)
     os.makedirs(os.path.dirname(dst_backup), exist_ok=True)
 
-    # Guardar backup determinista
-    shutil.copy2(src, dst_backup)
+    # Guardar backup determinista (se omite si ya es idéntico)
+    copy_if_changed(src, dst_backup)
 
     # Leer original
     try:
@@ -0,0 +1,161 @@
+import os
+import json
+from datetime import datetime
+
+
+# ---------------------------------------------------------
+# Log estructurado del procesado de fechas (JSON lines)
+# ---------------------------------------------------------
+# Un archivo por ejecución: logs/<perfil>/runs/<AAAAMMDD_HHMMSS>.jsonl
+# Tipos de registro, en orden:
+# - "run":     cabecera (perfil, juego, offset, módulos)
+# - "module":  inicio de módulo (o error si no existe la carpeta del juego)
+# - "file":    un archivo (estado, ms, bytes leídos/escritos, cambios, backup)
+# - "module_summary": totales del módulo
+# - "summary": totales de la ejecución (siempre la última línea)
+
+LOG_ROOT = "logs"
+RUNS_DIR = "runs"
+MAX_RUNS = 20           # ejecuciones que se conservan por perfil
+FLUSH_EVERY = 1000      # registros en memoria antes de escribir
+
+FILE_STATUSES = ("changed", "no_dates", "copied", "skipped")
+
+
+def runs_path(profile_name):
+    return os.path.join(LOG_ROOT, profile_name, RUNS_DIR)
+
+
+def empty_totals():
+    totals = {status: 0 for status in FILE_STATUSES}
+    totals.update({
+        "files": 0,
+        "changes": 0,
+        "bytes_in": 0,
+        "bytes_out": 0,
+        "backup_copied": 0,
+        "backup_skipped": 0,
+        "ms": 0.0,
+    })
+    return totals
+
+
+def add_to_totals(totals, entry):
+    totals["files"] += 1
+    totals[entry["status"]] += 1
+    totals["changes"] += entry["changes"]
+    totals["bytes_in"] += entry["bytes_in"]
+    totals["bytes_out"] += entry["bytes_out"]
+    totals["backup_copied" if entry["backup_copied"] else "backup_skipped"] += 1
+    totals["ms"] += entry["ms"]
+
+
+# ---------------------------------------------------------
+# Escritor con buffer
+# ---------------------------------------------------------
+class ProcessLogWriter:
+    """
+    Acumula registros y los escribe por lotes en el log de la ejecución.
+    Al cerrar se escribe el registro "summary" y se borran las ejecuciones
+    más antiguas del perfil.
+    """
+
+    def __init__(self, profile_name):
+        self.profile_name = profile_name
+        self.folder = runs_path(profile_name)
+        os.makedirs(self.folder, exist_ok=True)
+
+        self.started = datetime.now()
+        stamp = self.started.strftime("%Y%m%d_%H%M%S")
+
+        # Dos ejecuciones en el mismo segundo no se pisan
+        path = os.path.join(self.folder, f"{stamp}.jsonl")
+        n = 1
+        while os.path.exists(path):
+            path = os.path.join(self.folder, f"{stamp}_{n}.jsonl")
+            n += 1
+        self.path = path
+
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._buffer = []
+
+    def write(self, record):
+        self._buffer.append(json.dumps(record, ensure_ascii=False))
+        if len(self._buffer) >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+
+    def close(self, summary):
+        self.write(summary)
+        self.flush()
+        self._file.close()
+        self.rotate()
+
+    def rotate(self):
+        for name in list_runs(self.profile_name)[MAX_RUNS:]:
+            try:
+                os.remove(os.path.join(self.folder, name))
+            except OSError:
+                pass
+
+
+# ---------------------------------------------------------
+# Lectura (pestaña Logs)
+# ---------------------------------------------------------
+def list_runs(profile_name):
+    """
+    Nombres de los logs de ejecución del perfil, del más reciente al más antiguo.
+    """
+    folder = runs_path(profile_name)
+    if not os.path.isdir(folder):
+        return []
+    return sorted((f for f in os.listdir(folder) if f.endswith(".jsonl")), reverse=True)
+
+
+def read_run_summary(path):
+    """
+    Devuelve el registro "summary" (última línea) o None si la ejecución
+    no terminó.
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+
+            # El summary es la última línea: basta con leer el final
+            block = 1 << 16
+            while True:
+                start = max(0, size - block)
+                f.seek(start)
+                tail = f.read(size - start)
+                lines = tail.rstrip(b"\n").split(b"\n")
+                if len(lines) > 1 or start == 0:
+                    break
+                block *= 4
+
+        record = json.loads(lines[-1].decode("utf-8"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+    return record if record.get("type") == "summary" else None
+
+
+def recent_throughput(profile_name):
+    """
+    Bytes/s procesados en la última ejecución completa con archivos
+    procesados, o None si no hay ninguna.
+    """
+    folder = runs_path(profile_name)
+
+    for name in list_runs(profile_name):
+        summary = read_run_summary(os.path.join(folder, name))
+        if not summary or not summary.get("completed", True):
+            continue
+        if summary["bytes_in"] > 0 and summary["seconds"] > 0:
+            return summary["bytes_in"] / summary["seconds"]
+
+    return None
@@ -1,148 +1,606 @@
 import os
+import json
 import shutil
-import re
+import hashlib
+import time
 from datetime import datetime
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from core.config import modules_config
+from core.process_log import ProcessLogWriter, empty_totals, add_to_totals, recent_throughput
+from core.dates import shift_file_data, shift_file_stream, measure_file_stream, encode_output
+from utils.file_ops import copy_if_changed, files_match, write_bytes_atomic
 
 
 # ---------------------------------------------------------
-# Cargar módulos desde data/modules.json
+# Cargar módulos desde data/modules.json (caché de core.config)
 # ---------------------------------------------------------
 def load_modules():
-    import json
-    if not os.path.isfile("data/modules.json"):
+    return modules_config.get()
+
+
+# Archivos de texto a partir de este tamaño se procesan por bloques
+STREAM_THRESHOLD = 32 * 1024 * 1024
+
+# Máximo de archivos por lote enviado a cada proceso
+MAX_CHUNKSIZE = 64
+
+
+class ProcessCancelled(Exception):
+    pass
+
+
+# ---------------------------------------------------------
+# Número de procesos para el procesado en paralelo
+# ---------------------------------------------------------
+def resolve_workers(workers):
+    """
+    workers <= 0 o None → un proceso por núcleo.
+    """
+    if not workers or workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+# ---------------------------------------------------------
+# Recolectar archivos de un módulo (orden de os.walk)
+# ---------------------------------------------------------
+def collect_module_tasks(src, dst_mod, dst_backup, ignore_ext, offset):
+    """
+    Devuelve una lista de tareas (full_src, rel, full_mod, full_backup, offset),
+    una por archivo, en el mismo orden que el recorrido serie.
+    """
+    tasks = []
+
+    for base, _, files in os.walk(src):
+        for f in files:
+            ext = os.path.splitext(f)[1].lower()
+            if ext in ignore_ext:
+                continue
+
+            full_src = os.path.join(base, f)
+            rel = os.path.relpath(full_src, src)
+
+            tasks.append((
+                full_src,
+                rel,
+                os.path.join(dst_mod, rel),
+                os.path.join(dst_backup, rel),
+                offset,
+            ))
+
+    return tasks
+
+
+# ---------------------------------------------------------
+# Manifiesto incremental por perfil (data/manifests/<perfil>.json)
+# ---------------------------------------------------------
+# Por cada archivo del juego procesado se guarda: tamaño, mtime y hash del
+# origen, offset aplicado, rutas de mod/backup y hash/tamaño/mtime de la
+# salida. Si nada de eso cambia, la siguiente ejecución omite el archivo
+# (ni backup ni procesado).
+
+MANIFEST_DIR = os.path.join("data", "manifests")
+MANIFEST_VERSION = 1
+
+
+def manifest_path(profile_name):
+    return os.path.join(MANIFEST_DIR, f"{profile_name}.json")
+
+
+def manifest_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def load_manifest(profile_name):
+    path = manifest_path(profile_name)
+    if not os.path.isfile(path):
+        return {}
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
         return {}
-    with open("data/modules.json", "r", encoding="utf-8") as f:
-        return json.load(f)
+
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_manifest(profile_name, files):
+    path = manifest_path(profile_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Escritura atómica: un corte a mitad no deja un manifiesto corrupto
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "files": files}, f)
+    os.replace(tmp, path)
+
+
+def hash_file(path):
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _same_file(path, size, mtime_ns, digest):
+    """
+    ¿path sigue siendo el archivo registrado? Tamaño + mtime bastan;
+    si solo cambia el mtime se confirma por hash.
+    """
+    st = _stat(path)
+    if st is None or st[0] != size:
+        return False
+    if st[1] == mtime_ns:
+        return True
+    return digest is not None and hash_file(path) == digest
+
+
+def is_up_to_date(task, record):
+    """
+    True si el archivo ya se procesó con el mismo origen, offset y destinos,
+    y el backup y la salida del mod siguen intactos.
+    """
+    if not record:
+        return False
+
+    full_src, _, full_mod, full_backup, offset = task
+
+    if (
+        record.get("offset") != offset
+        or record.get("mod") != manifest_key(full_mod)
+        or record.get("backup") != manifest_key(full_backup)
+    ):
+        return False
+
+    if not _same_file(full_src, record["size"], record["mtime_ns"], record["hash"]):
+        return False
+
+    # El backup es una copia de copy2: mismo tamaño y mtime que el origen
+    if not _same_file(full_backup, record["size"], record["backup_mtime_ns"], record["hash"]):
+        return False
+
+    if record["output_hash"] is None:
+        # Sin cambios de fecha: no hay nada en el mod
+        return True
+
+    return _same_file(full_mod, record["output_size"], record["output_mtime_ns"], record["output_hash"])
 
 
 # ---------------------------------------------------------
-# Procesado de un módulo
+# Procesado de un archivo (se ejecuta en los procesos del pool)
 # ---------------------------------------------------------
-def process_module(game_key, module_name, game_root, mod_root, backup_root, offset, profile_name):
+def process_file(task, verify_backup=False, stream_threshold=STREAM_THRESHOLD):
     """
-    Procesa un módulo:
-    - Copia archivos del juego al backup SIEMPRE
-    - Copia archivos al mod SOLO si realmente cambian (offset aplicado)
-    - NO crea carpetas vacías en el mod
-    - Genera logs
+    Copia al backup y, si procede, escribe el archivo en el mod.
+    Los archivos de texto de stream_threshold bytes o más se procesan por
+    bloques con memoria constante.
+    Devuelve (registro "file" del log, registro para el manifiesto).
     """
+    started = time.perf_counter()
+
+    full_src, rel, full_mod, full_backup, offset = task
+    ext = os.path.splitext(full_src)[1].lower()
+
+    # ---------------------------------------------------------
+    # BACKUP (se omite la copia si ya es idéntico)
+    # ---------------------------------------------------------
+    backup_copied = copy_if_changed(full_src, full_backup, verify_backup)
+
+    src_size, src_mtime = _stat(full_src)
+    record = {
+        "offset": offset,
+        "mod": manifest_key(full_mod),
+        "backup": manifest_key(full_backup),
+        "size": src_size,
+        "mtime_ns": src_mtime,
+        "backup_mtime_ns": _stat(full_backup)[1],
+        "hash": None,
+        "output_hash": None,
+        "output_size": None,
+        "output_mtime_ns": None,
+    }
+
+    entry = {
+        "type": "file",
+        "rel": rel,
+        "status": "no_dates",
+        "ms": 0.0,
+        "bytes_in": src_size,
+        "bytes_out": 0,
+        "changes": 0,
+        "backup_copied": backup_copied,
+    }
+
+    # ---------------------------------------------------------
+    # PROCESAR ARCHIVOS DE TEXTO
+    # ---------------------------------------------------------
+    if ext in [".txt", ".yml"]:
+        if src_size >= stream_threshold:
+            # Archivo grande: por bloques, directamente a un temporal del mod
+            # (el md5 del origen sale de la misma lectura)
+            changes, out_hash, record["hash"] = shift_file_stream(full_src, full_mod, offset)
+
+        else:
+            # Leer una sola vez y aplicar offset
+            with open(full_src, "rb") as f_in:
+                data = f_in.read()
+
+            record["hash"] = hashlib.md5(data).hexdigest()
+
+            # Archivos ASCII: se procesan como bytes sin decodificar
+            processed, changes = shift_file_data(data, offset)
+
+            # ¿Hubo cambios reales? Crear carpeta SOLO si se va a copiar al mod
+            if changes:
+                # Mismos bytes que open(..., "w", encoding="utf-8")
+                out_data = encode_output(processed)
+                write_bytes_atomic(full_mod, out_data)
+                out_hash = hashlib.md5(out_data).hexdigest()
+
+        if changes:
+            record["output_hash"] = out_hash
+            record["output_size"], record["output_mtime_ns"] = _stat(full_mod)
+
+            entry["status"] = "changed"
+            entry["changes"] = changes
+            entry["bytes_out"] = record["output_size"]
+
+        entry["ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return entry, record
+
+    # ---------------------------------------------------------
+    # ARCHIVOS NO TEXTUALES → copiar siempre al mod
+    # ---------------------------------------------------------
+    os.makedirs(os.path.dirname(full_mod), exist_ok=True)
+    shutil.copy2(full_src, full_mod)
 
-    # Cargar módulos
-    modules = load_modules()
-    if game_key not in modules or module_name not in modules[game_key]:
+    record["hash"] = record["output_hash"] = hash_file(full_src)
+    record["output_size"], record["output_mtime_ns"] = _stat(full_mod)
+
+    entry["status"] = "copied"
+    entry["bytes_out"] = record["output_size"]
+    entry["ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return entry, record
+
+
+# ---------------------------------------------------------
+# Ejecutar tareas en serie o repartidas en un ProcessPoolExecutor
+# ---------------------------------------------------------
+def map_tasks(job, tasks, workers=1):
+    """
+    Devuelve job(task) para cada tarea en el mismo orden que tasks,
+    sea cual sea el número de procesos. job debe poder serializarse (pickle).
+    """
+    workers = min(resolve_workers(workers), len(tasks))
+
+    if workers <= 1:
+        for task in tasks:
+            yield job(task)
         return
 
-    cfg = modules[game_key][module_name]
-    rel_path = cfg["path"]
-    ignore_ext = cfg.get("ignore_ext", [])
+    # Lotes grandes: miles de archivos pequeños, poco coste de pickle por tarea.
+    # Con tope, para que una cancelación no tenga que esperar lotes enormes
+    chunksize = max(1, min(MAX_CHUNKSIZE, len(tasks) // (workers * 8)))
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        yield from executor.map(job, tasks, chunksize=chunksize)
+    finally:
+        # Si se abandona el generador (cancelación) no se lanza lo pendiente
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def run_tasks(tasks, workers=1, verify_backup=False, stream_threshold=STREAM_THRESHOLD):
+    """
+    Resultados de process_file en el mismo orden que tasks.
+    """
+    job = partial(process_file, verify_backup=verify_backup, stream_threshold=stream_threshold)
+    return map_tasks(job, tasks, workers)
+
+
+# ---------------------------------------------------------
+# Módulos seleccionados → tareas por módulo
+# ---------------------------------------------------------
+def collect_jobs(game_key, module_names, game_root, mod_root, backup_root, offset, create_dirs=True, modules=None):
+    """
+    Devuelve [(module_name, src, tareas o None)]; None si no existe la
+    carpeta del juego. create_dirs=False no toca el disco (estimación).
+    modules: config de modules.json ya cargada (None → load_modules()).
+    """
+    if modules is None:
+        modules = load_modules()
+    game_modules = modules.get(game_key, {})
+
+    jobs = []
+
+    for module_name in module_names:
+        if module_name not in game_modules:
+            continue
+
+        cfg = game_modules[module_name]
+        rel_path = cfg["path"]
+        ignore_ext = cfg.get("ignore_ext", [])
+
+        src = os.path.join(game_root, rel_path)
+        dst_mod = os.path.join(mod_root, rel_path)
+        dst_backup = os.path.join(backup_root, rel_path)
+
+        # Crear carpeta base del backup (SIEMPRE)
+        if create_dirs:
+            os.makedirs(dst_backup, exist_ok=True)
+
+        tasks = None
+        if os.path.isdir(src):
+            tasks = collect_module_tasks(src, dst_mod, dst_backup, ignore_ext, offset)
+
+        jobs.append((module_name, src, tasks))
+
+    return jobs
+
+
+def find_up_to_date(tasks, manifest):
+    """
+    Rutas de origen que el manifiesto da por procesadas y sin cambios.
+    """
+    return {
+        task[0] for task in tasks
+        if is_up_to_date(task, manifest.get(manifest_key(task[0])))
+    }
+
 
-    src = os.path.join(game_root, rel_path)
-    dst_mod = os.path.join(mod_root, rel_path)
-    dst_backup = os.path.join(backup_root, rel_path)
+# ---------------------------------------------------------
+# Procesado de varios módulos (archivos repartidos entre procesos)
+# ---------------------------------------------------------
+def process_modules(game_key, module_names, game_root, mod_root, backup_root, offset, profile_name, workers=1, incremental=True, verify_backup=False, stream_threshold=STREAM_THRESHOLD, progress=None, cancel=None, modules=None):
+    """
+    Procesa varios módulos con el mismo resultado que procesarlos uno a uno
+    en orden:
+    - Los archivos de todos los módulos se reparten entre `workers` procesos
+      (0 o None → un proceso por núcleo)
+    - Con incremental=True se omiten los archivos que el manifiesto del perfil
+      da por procesados y sin cambios
+    - El backup solo se copia si difiere (tamaño/mtime; verify_backup=True
+      compara además el contenido cuando solo cambia el mtime)
+    - Los .txt/.yml de stream_threshold bytes o más se procesan por bloques
+    - Se escribe un log JSON lines por ejecución (core/process_log.py),
+      por módulo y en el orden del recorrido
+    - progress(hechos, total, rel) se llama tras cada archivo
+    - cancel (threading.Event o similar): si se activa, se para entre
+      archivos; las escrituras en el mod son atómicas, nunca quedan a medias
+    - modules: config de modules.json ya cargada (None → load_modules())
+    Devuelve el registro "summary" del log.
+    """
 
-    # Crear carpeta base del backup (SIEMPRE)
-    os.makedirs(dst_backup, exist_ok=True)
+    jobs = collect_jobs(game_key, module_names, game_root, mod_root, backup_root, offset, modules=modules)
+    all_tasks = [task for _, _, tasks in jobs if tasks for task in tasks]
 
     # ---------------------------------------------------------
-    # LOGS
+    # MANIFIESTO: separar archivos sin cambios desde la última ejecución
     # ---------------------------------------------------------
-    log_path = os.path.join("logs", profile_name)
-    os.makedirs(log_path, exist_ok=True)
-
-    log_file = os.path.join(log_path, f"{module_name}.log")
-    os.makedirs(os.path.dirname(log_file), exist_ok=True)
-
-    with open(log_file, "a", encoding="utf-8") as log:
-        log.write(f"\n--- Procesado {module_name} --- {datetime.now()}\n")
-
-        if not os.path.isdir(src):
-            log.write(f"ERROR: No existe la carpeta del juego: {src}\n")
-            return
-
-        # ---------------------------------------------------------
-        # RECORRER ARCHIVOS DEL MÓDULO
-        # ---------------------------------------------------------
-        for base, _, files in os.walk(src):
-            for f in files:
-                ext = os.path.splitext(f)[1].lower()
-                if ext in ignore_ext:
-                    continue
-
-                full_src = os.path.join(base, f)
-                rel = os.path.relpath(full_src, src)
-
-                full_mod = os.path.join(dst_mod, rel)
-                full_backup = os.path.join(dst_backup, rel)
-
-                # Crear carpeta destino del backup
-                os.makedirs(os.path.dirname(full_backup), exist_ok=True)
-
-                # ---------------------------------------------------------
-                # COPIA SIEMPRE AL BACKUP
-                # ---------------------------------------------------------
-                shutil.copy2(full_src, full_backup)
-
-                # ---------------------------------------------------------
-                # PROCESAR ARCHIVOS DE TEXTO
-                # ---------------------------------------------------------
-                if ext in [".txt", ".yml"]:
-                    # Leer original
-                    try:
-                        with open(full_src, "r", encoding="utf-8") as f_in:
-                            original = f_in.read()
-                    except UnicodeDecodeError:
-                        with open(full_src, "r", encoding="latin-1") as f_in:
-                            original = f_in.read()
-
-                    # Aplicar offset
-                    processed = apply_offset_to_file(full_src, offset)
-
-                    # ¿Hubo cambios reales?
-                    if processed != original:
-                        # Crear carpeta SOLO si se va a copiar al mod
-                        os.makedirs(os.path.dirname(full_mod), exist_ok=True)
-
-                        with open(full_mod, "w", encoding="utf-8") as out:
-                            out.write(processed)
-
-                        log.write(f"Procesado (cambia fecha): {rel}\n")
-                    else:
-                        log.write(f"Sin cambios de fecha (no copiado al mod): {rel}\n")
+    manifest = load_manifest(profile_name)
+    skipped = find_up_to_date(all_tasks, manifest) if incremental else set()
+
+    # Módulos anidados (p. ej. "events" y "events/dlc/bp2") comparten archivos:
+    # cada origen se procesa una sola vez, nunca en dos procesos a la vez
+    pending = {}
+    for task in all_tasks:
+        if task[0] not in skipped:
+            pending.setdefault(task[0], task)
 
+    results = run_tasks(list(pending.values()), workers, verify_backup, stream_threshold)
+    processed = {}      # origen → registro "file" ya obtenido
+
+    # ---------------------------------------------------------
+    # LOG (en orden de módulo y de archivo)
+    # ---------------------------------------------------------
+    started = time.perf_counter()
+
+    log = ProcessLogWriter(profile_name)
+    log.write({
+        "type": "run",
+        "started": log.started.isoformat(timespec="seconds"),
+        "profile": profile_name,
+        "game": game_key,
+        "offset": offset,
+        "modules": [name for name, _, _ in jobs],
+        "incremental": incremental,
+    })
+
+    totals = empty_totals()
+    module_totals = {}
+    completed = False
+    cancelled = False
+
+    done = 0
+    total = len(all_tasks)
+
+    try:
+        for module_name, src, tasks in jobs:
+            if tasks is None:
+                log.write({"type": "module", "module": module_name, "src": src,
+                           "error": "No existe la carpeta del juego"})
+                continue
+
+            log.write({"type": "module", "module": module_name, "src": src})
+            mod_totals = empty_totals()
+
+            for task in tasks:
+                if cancel is not None and cancel.is_set():
+                    raise ProcessCancelled()
+
+                full_src, rel = task[0], task[1]
+
+                if full_src in skipped:
+                    entry = {
+                        "type": "file", "rel": rel, "status": "skipped", "ms": 0.0,
+                        "bytes_in": 0, "bytes_out": 0, "changes": 0, "backup_copied": False,
+                    }
+                elif full_src in processed:
+                    # Ya procesado en otro módulo: se registra con el mismo resultado
+                    entry = dict(processed[full_src], rel=rel)
                 else:
-                    # ---------------------------------------------------------
-                    # ARCHIVOS NO TEXTUALES → copiar siempre al mod
-                    # ---------------------------------------------------------
-                    os.makedirs(os.path.dirname(full_mod), exist_ok=True)
-                    shutil.copy2(full_src, full_mod)
-                    log.write(f"Copiado sin cambios: {rel}\n")
+                    entry, record = next(results)
+                    manifest[manifest_key(full_src)] = record
+                    processed[full_src] = dict(entry)
+
+                entry["module"] = module_name
+                log.write(entry)
+                add_to_totals(mod_totals, entry)
+                add_to_totals(totals, entry)
+
+                done += 1
+                if progress is not None:
+                    progress(done, total, rel)
+
+            log.write({"type": "module_summary", "module": module_name, **mod_totals})
+            module_totals[module_name] = mod_totals
+
+        completed = True
+
+    except ProcessCancelled:
+        cancelled = True
+
+    finally:
+        # Parar el pool sin lanzar los lotes pendientes
+        results.close()
+
+        # Lo ya procesado queda registrado aunque la ejecución se corte
+        save_manifest(profile_name, manifest)
+
+        totals["seconds"] = time.perf_counter() - started
+        summary = {
+            "type": "summary",
+            "finished": datetime.now().isoformat(timespec="seconds"),
+            "completed": completed,
+            "cancelled": cancelled,
+            "modules": module_totals,
+            "missing": [name for name, _, tasks in jobs if tasks is None],
+            **totals,
+        }
+        log.close(summary)
+
+    return summary
 
 
 # ---------------------------------------------------------
-# Aplicar offset a un archivo
+# Estimación sin escribir nada (dry-run)
 # ---------------------------------------------------------
-def apply_offset_to_file(path, offset):
+def scan_file(task, verify_backup=False, stream_threshold=STREAM_THRESHOLD):
     """
-    Aplica offset a fechas con formato:
-    - 867.1.1
-    - 1066.9.15
-    - 1453.1.1
+    Igual que process_file pero solo lee: devuelve el registro "file" que
+    tendría el log (backup_copied = habría que copiar el backup).
     """
+    full_src, rel, full_mod, full_backup, offset = task
+    ext = os.path.splitext(full_src)[1].lower()
 
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            text = f.read()
-    except UnicodeDecodeError:
-        with open(path, "r", encoding="latin-1") as f:
-            text = f.read()
+    src_size = os.path.getsize(full_src)
+
+    entry = {
+        "type": "file",
+        "rel": rel,
+        "status": "no_dates",
+        "ms": 0.0,
+        "bytes_in": src_size,
+        "bytes_out": 0,
+        "changes": 0,
+        "backup_copied": not files_match(full_src, full_backup, verify_backup),
+    }
+
+    if ext in [".txt", ".yml"]:
+        if src_size >= stream_threshold:
+            changes, out_bytes = measure_file_stream(full_src, offset)
+        else:
+            with open(full_src, "rb") as f_in:
+                processed, changes = shift_file_data(f_in.read(), offset)
+            out_bytes = len(encode_output(processed)) if changes else 0
+
+        if changes:
+            entry["status"] = "changed"
+            entry["changes"] = changes
+            entry["bytes_out"] = out_bytes
+
+        return entry
+
+    entry["status"] = "copied"
+    entry["bytes_out"] = src_size
+    return entry
+
+
+def estimate_modules(game_key, module_names, game_root, mod_root, backup_root, offset, profile_name, workers=1, incremental=True, verify_backup=False, stream_threshold=STREAM_THRESHOLD, modules=None):
+    """
+    Recorre los módulos con el mismo matcher que process_modules sin tocar
+    el mod, el backup, el manifiesto ni los logs. Devuelve un dict con:
+    - modules: totales por módulo (mismas claves que el log de ejecución)
+    - missing: módulos sin carpeta en el juego
+    - totals: totales de todo
+    - scan_seconds: lo que ha tardado la estimación
+    - estimated_seconds: tiempo aproximado del procesado real, según el
+      rendimiento de la última ejecución; sin historial es scan_seconds,
+      solo una cota inferior (from_history=False)
+    """
+    started = time.perf_counter()
+
+    jobs = collect_jobs(game_key, module_names, game_root, mod_root, backup_root, offset, create_dirs=False, modules=modules)
+    all_tasks = [task for _, _, tasks in jobs if tasks for task in tasks]
+
+    manifest = load_manifest(profile_name)
+    skipped = find_up_to_date(all_tasks, manifest) if incremental else set()
+
+    job = partial(scan_file, verify_backup=verify_backup, stream_threshold=stream_threshold)
+    results = map_tasks(job, [t for t in all_tasks if t[0] not in skipped], workers)
+
+    totals = empty_totals()
+    module_totals = {}
+
+    for module_name, _, tasks in jobs:
+        if tasks is None:
+            continue
+
+        mod_totals = empty_totals()
+
+        for task in tasks:
+            if task[0] in skipped:
+                entry = {
+                    "status": "skipped", "ms": 0.0, "bytes_in": 0, "bytes_out": 0,
+                    "changes": 0, "backup_copied": False,
+                }
+            else:
+                entry = next(results)
+
+            add_to_totals(mod_totals, entry)
+            add_to_totals(totals, entry)
+
+        module_totals[module_name] = mod_totals
 
-    # Regex para fechas tipo 1066.9.15
-    pattern = r"\b(\d{3,4})\.(\d{1,2})\.(\d{1,2})\b"
+    scan_seconds = time.perf_counter() - started
 
-    def repl(match):
-        year = int(match.group(1)) + offset
-        month = match.group(2)
-        day = match.group(3)
-        return f"{year}.{month}.{day}"
+    # El procesado real además escribe mod y backup: sin historial, el
+    # escaneo es solo una cota inferior
+    throughput = recent_throughput(profile_name)
+    if throughput:
+        estimated_seconds = totals["bytes_in"] / throughput
+    else:
+        estimated_seconds = scan_seconds
 
-    return re.sub(pattern, repl, text)
+    return {
+        "modules": module_totals,
+        "missing": [name for name, _, tasks in jobs if tasks is None],
+        "totals": totals,
+        "scan_seconds": scan_seconds,
+        "estimated_seconds": estimated_seconds,
+        "from_history": throughput is not None,
+    }
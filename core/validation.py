@@ -1,40 +1,139 @@
 import os
+import stat
 import difflib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from core.validation_cache import ValidationCache
+
+
+# ---------------------------------------------------------
+# Índice de una carpeta (os.scandir)
+# ---------------------------------------------------------
+def scan_tree(base_path):
+    """
+    {ruta relativa con "/": (tamaño, mtime_ns)} de los archivos bajo base_path.
+    Mismos archivos que os.walk (no entra en enlaces a carpetas); la ruta
+    relativa se construye sobre la marcha, sin relpath.
+    """
+    files = {}
+    stack = [(base_path, "")]
+
+    while stack:
+        folder, prefix = stack.pop()
+        try:
+            entries = os.scandir(folder)
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            stack.append((entry.path, prefix + entry.name + "/"))
+                    elif entry.is_file():
+                        st = entry.stat()
+                        files[prefix + entry.name] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    continue
+
+    return files
+
+
+# En Windows os.path.isfile no distingue mayúsculas: las búsquedas tampoco
+_CASE_INSENSITIVE = os.path.normcase("A") == "a"
+
+
+class TreeIndex:
+    """
+    Índices de carpetas de una sesión de validación: cada carpeta se recorre
+    una sola vez aunque la pidan varias comparaciones (p. ej. el mod en
+    "Juego ↔ Mod" y "Mod ↔ Backup"). Se crea uno nuevo por validación para
+    no arrastrar archivos que hayan cambiado entre medias.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._trees = {}        # carpeta → {rel: (tamaño, mtime_ns)}
+        self._folded = {}       # carpeta → {rel en minúsculas: ...} (solo Windows)
+
+    def files(self, base_path):
+        key = os.path.normcase(os.path.abspath(base_path))
+        with self._lock:
+            tree = self._trees.get(key)
+        if tree is None:
+            tree = scan_tree(base_path)
+            with self._lock:
+                tree = self._trees.setdefault(key, tree)
+        return tree
+
+    def stat(self, base_path, rel):
+        """
+        (tamaño, mtime_ns) de base_path/rel o None si no es un archivo.
+        """
+        tree = self.files(base_path)
+        st = tree.get(rel)
+        if st is not None or not _CASE_INSENSITIVE:
+            return st
+
+        key = os.path.normcase(os.path.abspath(base_path))
+        with self._lock:
+            folded = self._folded.get(key)
+            if folded is None:
+                folded = self._folded[key] = {os.path.normcase(r): v for r, v in tree.items()}
+        return folded.get(os.path.normcase(rel))
 
 
 # ---------------------------------------------------------
 # Recolectar archivos de un módulo
 # ---------------------------------------------------------
-def collect_module_files(game_root, backup_root, rel_path):
+def collect_module_files(game_root, backup_root, rel_path, index=None):
     """
     Devuelve dos diccionarios:
     - game_files[rel] = ruta absoluta en el juego
     - backup_files[rel] = ruta absoluta en el backup
+    Con index (TreeIndex) las carpetas ya recorridas no se vuelven a leer.
     """
+    if index is None:
+        index = TreeIndex()
 
-    src_game = os.path.join(game_root, rel_path)
-    src_backup = os.path.join(backup_root, rel_path)
+    result = []
+    for root in (game_root, backup_root):
+        src = os.path.join(root, rel_path)
+        files = {}
+        for rel in index.files(src):
+            rel = rel.replace("/", os.sep)
+            files[rel] = os.path.join(src, rel)
+        result.append(files)
 
-    game_files = {}
-    backup_files = {}
+    game_files, backup_files = result
+    return game_files, backup_files
 
-    # Archivos del juego
-    if os.path.isdir(src_game):
-        for base, _, files in os.walk(src_game):
-            for f in files:
-                full = os.path.join(base, f)
-                rel = os.path.relpath(full, src_game)
-                game_files[rel] = full
 
-    # Archivos del backup
-    if os.path.isdir(src_backup):
-        for base, _, files in os.walk(src_backup):
-            for f in files:
-                full = os.path.join(base, f)
-                rel = os.path.relpath(full, src_backup)
-                backup_files[rel] = full
+# ---------------------------------------------------------
+# ¿Mismos bytes? (tamaño y comparación por bloques)
+# ---------------------------------------------------------
+COMPARE_CHUNK_SIZE = 1 << 20
 
-    return game_files, backup_files
+
+def files_identical(path_a, path_b):
+    """
+    True si los dos archivos tienen exactamente los mismos bytes.
+    Se corta en cuanto el tamaño o un bloque difiere.
+    """
+    if os.path.getsize(path_a) != os.path.getsize(path_b):
+        return False
+
+    with open(path_a, "rb") as fa, open(path_b, "rb") as fb:
+        while True:
+            block_a = fa.read(COMPARE_CHUNK_SIZE)
+            block_b = fb.read(COMPARE_CHUNK_SIZE)
+            if block_a != block_b:
+                return False
+            if not block_a:
+                return True
 
 
 # ---------------------------------------------------------
@@ -46,8 +145,15 @@ def compare_file_contents(game_path, backup_path):
     Devuelve:
     - True, [] si son iguales
     - False, diff_lines si son diferentes
+
+    Mismos bytes → iguales sin decodificar. Solo si difieren se leen las
+    líneas (CRLF/LF o UTF-8/Latin-1 pueden seguir contando como iguales)
+    y solo si las líneas difieren se calcula el diff.
     """
 
+    if files_identical(game_path, backup_path):
+        return True, []
+
     game_lines = read_file_lines(game_path)
     backup_lines = read_file_lines(backup_path)
 
@@ -65,6 +171,75 @@ def compare_file_contents(game_path, backup_path):
     return False, diff
 
 
+# ---------------------------------------------------------
+# Solo igualdad (sin diff) / solo diff
+# ---------------------------------------------------------
+def files_equal(game_path, backup_path):
+    """
+    Mismo resultado que compare_file_contents(...)[0], sin calcular el diff.
+    """
+    if files_identical(game_path, backup_path):
+        return True
+    return read_file_lines(game_path) == read_file_lines(backup_path)
+
+
+def lines_equal(game_path, backup_path):
+    """
+    Comparación decodificada (se ejecuta en el pool de procesos).
+    """
+    return read_file_lines(game_path) == read_file_lines(backup_path)
+
+
+def file_diff(game_path, backup_path):
+    """
+    Mismo resultado que compare_file_contents(...)[1].
+    """
+    return compare_file_contents(game_path, backup_path)[1]
+
+
+# ---------------------------------------------------------
+# Caché LRU de diffs calculados bajo demanda
+# ---------------------------------------------------------
+class DiffCache:
+    """
+    Guarda los últimos max_entries diffs. La clave incluye tamaño y mtime
+    de ambos archivos: si cambian en disco, el diff se recalcula.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def _key(self, left, right):
+        key = [left, right]
+        for path in (left, right):
+            try:
+                st = os.stat(path)
+                key += [st.st_size, st.st_mtime_ns]
+            except OSError:
+                key += [None, None]
+        return tuple(key)
+
+    def get(self, left, right):
+        key = self._key(left, right)
+
+        diff = self._entries.get(key)
+        if diff is not None:
+            self._entries.move_to_end(key)
+            return diff
+
+        diff = file_diff(left, right)
+        self._entries[key] = diff
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        return diff
+
+    def clear(self):
+        self._entries.clear()
+
+
 # ---------------------------------------------------------
 # Lectura segura de archivos
 # ---------------------------------------------------------
@@ -80,3 +255,291 @@ def read_file_lines(path):
     except UnicodeDecodeError:
         with open(path, "r", encoding="latin-1") as f:
             return f.readlines()
+
+
+# =========================================================
+# Motor de validación en paralelo
+# =========================================================
+# - Hilos: existencia de archivos y comparación de bytes (E/S)
+# - Procesos: decodificar y comparar líneas cuando los bytes difieren (CPU);
+#   el pool se crea solo si hace falta
+# - Caché por perfil (core.validation_cache): los pares cuyo tamaño y mtime
+#   no han cambiado no se vuelven a leer
+# Los resultados se devuelven en el mismo orden y con la misma clasificación
+# que la validación en serie; los diffs se siguen calculando al abrirlos.
+
+class ValidationCancelled(Exception):
+    pass
+
+
+def _file_stat(path):
+    """
+    (tamaño, mtime_ns) si path es un archivo, None si no (como os.path.isfile).
+    """
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class _ComparePools:
+    def __init__(self, io_workers=None, cpu_workers=None, cache=None):
+        self.threads = ThreadPoolExecutor(max_workers=io_workers)
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.cache = cache
+        self._processes = None
+        self._lock = threading.Lock()
+
+    def files_equal(self, left, right, left_stat, right_stat):
+        if self.cache is not None:
+            equal = self.cache.lookup(left, right, left_stat, right_stat)
+            if equal is not None:
+                return equal
+
+        equal = files_identical(left, right)
+        if not equal:
+            with self._lock:
+                if self._processes is None:
+                    self._processes = ProcessPoolExecutor(max_workers=self.cpu_workers)
+                processes = self._processes
+
+            equal = processes.submit(lines_equal, left, right).result()
+
+        if self.cache is not None:
+            self.cache.store(left, right, left_stat, right_stat, equal)
+        return equal
+
+    def shutdown(self, completed=False):
+        # Lo pendiente se descarta; lo que está en curso termina su archivo
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+        self.threads.shutdown(wait=True, cancel_futures=True)
+
+        # Los veredictos ya calculados valen aunque se haya cancelado, pero
+        # solo una validación completa sabe qué filas sobran
+        if self.cache is not None:
+            self.cache.save(prune=completed)
+
+
+def _pair_status(pools, path, backup_path, path_stat, backup_stat):
+    """
+    "Eliminado" (solo backup), "Añadido" (sin backup), "Igual", "Modificado"
+    o None si no existe ninguno.
+    """
+    if path_stat is None:
+        return "Eliminado" if backup_stat is not None else None
+    if backup_stat is None:
+        return "Añadido"
+    return "Igual" if pools.files_equal(path, backup_path, path_stat, backup_stat) else "Modificado"
+
+
+def _module_file_status(pools, index, f, mod_dir, game_dir, backup_dir):
+    backup_path = os.path.join(backup_dir, f)
+    backup_stat = index.stat(backup_dir, f)
+    return (
+        _pair_status(pools, os.path.join(mod_dir, f), backup_path,
+                     index.stat(mod_dir, f), backup_stat),
+        _pair_status(pools, os.path.join(game_dir, f), backup_path,
+                     index.stat(game_dir, f), backup_stat),
+    )
+
+
+def _ordered_results(futures, total, progress, cancel):
+    """
+    Resultados de los futures en el orden en que se encolaron.
+    progress(hechos, total) por resultado; cancel.is_set() → ValidationCancelled.
+    """
+    for done, future in enumerate(futures, 1):
+        if cancel is not None and cancel.is_set():
+            raise ValidationCancelled()
+        result = future.result()
+        if progress is not None:
+            progress(done, total)
+        yield result
+
+
+# ---------------------------------------------------------
+# Todos los módulos: MOD ↔ Backup y Juego ↔ Backup
+# ---------------------------------------------------------
+def summarize_counts(counts):
+    return (
+        f"{sum(counts.values())} archivos — "
+        f"{counts['Modificado']} modificados, "
+        f"{counts['Igual']} iguales, "
+        f"{counts['Añadido']} añadidos, "
+        f"{counts['Eliminado']} eliminados"
+    )
+
+
+def validate_modules_full(game_root, mod_root, backup_root, game_modules, module_names,
+                          io_workers=None, cpu_workers=None, progress=None, cancel=None,
+                          profile_name=None, verify_content=False):
+    """
+    Generador: por cada módulo (en orden) devuelve
+    (module_name, estado_mod, estado_game, detalles_mod, detalles_game)
+    con detalles = [(archivo, estado, (ruta, ruta_backup) o None)].
+    progress(hechos, total) por archivo; cancel.is_set() → ValidationCancelled.
+    Con profile_name se usa la caché de validación del perfil;
+    verify_content vuelve a comparar los pares modificados hace poco.
+    """
+    index = TreeIndex()
+    cache = ValidationCache(profile_name, "modules", verify_content) if profile_name else None
+    pools = _ComparePools(io_workers, cpu_workers, cache)
+    completed = False
+    try:
+        targets = []
+        for module_name in module_names:
+            if module_name not in game_modules:
+                continue
+
+            cfg = game_modules[module_name]
+            rel = cfg["path"]
+            ignore_ext = cfg.get("ignore_ext", [])
+
+            targets.append((
+                module_name,
+                ignore_ext,
+                os.path.join(mod_root, rel),
+                os.path.join(game_root, rel),
+                os.path.join(backup_root, rel),
+            ))
+
+        # Las carpetas se indexan en paralelo (una vez cada una)
+        scans = [
+            pools.threads.submit(index.files, folder)
+            for _, _, mod_dir, game_dir, backup_dir in targets
+            for folder in (mod_dir, game_dir, backup_dir)
+        ]
+        for scan in scans:
+            if cancel is not None and cancel.is_set():
+                raise ValidationCancelled()
+            scan.result()
+
+        plans = []
+        for module_name, ignore_ext, mod_dir, game_dir, backup_dir in targets:
+            all_files = sorted(set(index.files(mod_dir)).union(
+                index.files(game_dir), index.files(backup_dir)
+            ))
+            files = [f for f in all_files if os.path.splitext(f)[1].lower() not in ignore_ext]
+            plans.append((module_name, files, mod_dir, game_dir, backup_dir))
+
+        # Todo se encola de golpe: los hilos no esperan a que acabe un módulo
+        futures = [
+            pools.threads.submit(_module_file_status, pools, index, f, mod_dir, game_dir, backup_dir)
+            for _, files, mod_dir, game_dir, backup_dir in plans
+            for f in files
+        ]
+        results = _ordered_results(futures, len(futures), progress, cancel)
+
+        for module_name, files, mod_dir, game_dir, backup_dir in plans:
+            statuses = [next(results) for _ in files]
+
+            detalles_mod = []
+            detalles_game = []
+            counts_mod = {"Igual": 0, "Modificado": 0, "Añadido": 0, "Eliminado": 0}
+            counts_game = dict(counts_mod)
+
+            for f, (status_mod, status_game) in zip(files, statuses):
+                backup_path = os.path.join(backup_dir, f)
+
+                for status, path, detalles, counts in (
+                    (status_mod, os.path.join(mod_dir, f), detalles_mod, counts_mod),
+                    (status_game, os.path.join(game_dir, f), detalles_game, counts_game),
+                ):
+                    if status is None:
+                        continue
+                    counts[status] += 1
+                    if status == "Modificado":
+                        detalles.append((f, status, (path, backup_path)))
+                    elif status != "Igual":
+                        detalles.append((f, status, None))
+
+            yield (
+                module_name,
+                summarize_counts(counts_mod),
+                summarize_counts(counts_game),
+                detalles_mod,
+                detalles_game,
+            )
+
+        completed = True
+    finally:
+        pools.shutdown(completed)
+
+
+# ---------------------------------------------------------
+# Todos los archivos de files.json
+# ---------------------------------------------------------
+def _file_entry_status(pools, path, backup_path, missing_label):
+    """
+    (estado, par para el diff o None) con los textos de la vista de archivos.
+    """
+    # Archivos sueltos: un stat directo sale más barato que indexar su carpeta
+    path_stat = _file_stat(path)
+    if path_stat is None:
+        return missing_label, None
+
+    backup_stat = _file_stat(backup_path)
+    if backup_stat is None:
+        return "[-] Solo en BACKUP", None
+
+    if pools.files_equal(path, backup_path, path_stat, backup_stat):
+        return "[=] Igual", None
+    return "[!] Cambiado", (path, backup_path)
+
+
+def _file_entry(pools, game_path, mod_path, backup_path):
+    return (
+        _file_entry_status(pools, mod_path, backup_path, "[+] Solo en JUEGO"),
+        _file_entry_status(pools, game_path, backup_path, "[+] Solo en MOD"),
+    )
+
+
+def validate_files_full(game_root, mod_root, backup_root, game_files, file_keys,
+                        io_workers=None, cpu_workers=None, progress=None, cancel=None,
+                        profile_name=None, verify_content=False):
+    """
+    Generador: por cada archivo activo (en orden) devuelve
+    (file_key, estado_mod, pair_mod, estado_game, pair_game).
+    Con profile_name se usa la caché de validación del perfil;
+    verify_content vuelve a comparar los pares modificados hace poco.
+    """
+    entries = []
+
+    for file_key in file_keys:
+        if file_key not in game_files:
+            continue
+
+        data = game_files[file_key]
+
+        rel_game = data["path"]
+        rel_mod = data.get("map_to", rel_game)
+
+        entries.append((
+            file_key,
+            os.path.join(game_root, rel_game),
+            os.path.join(mod_root, rel_mod),
+            os.path.join(backup_root, rel_game),
+        ))
+
+    cache = ValidationCache(profile_name, "files", verify_content) if profile_name else None
+    pools = _ComparePools(io_workers, cpu_workers, cache)
+    completed = False
+    try:
+        futures = [
+            pools.threads.submit(_file_entry, pools, game_path, mod_path, backup_path)
+            for _, game_path, mod_path, backup_path in entries
+        ]
+        results = _ordered_results(futures, len(futures), progress, cancel)
+
+        for (file_key, _, _, _), result in zip(entries, results):
+            (estado_mod, pair_mod), (estado_game, pair_game) = result
+
+            yield file_key, estado_mod, pair_mod, estado_game, pair_game
+
+        completed = True
+    finally:
+        pools.shutdown(completed)
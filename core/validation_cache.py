@@ -0,0 +1,173 @@
+import os
+import time
+import sqlite3
+import threading
+
+from utils.file_ops import MTIME_TOLERANCE_NS
+
+
+# ---------------------------------------------------------
+# Caché persistente de la validación (un SQLite por perfil)
+# ---------------------------------------------------------
+# data/validation_cache/<perfil>.sqlite guarda, por cada par comparado
+# (archivo, backup), el (tamaño, mtime_ns) de los dos lados y si eran
+# iguales. Mientras ninguno de los dos cambie, el veredicto se reutiliza
+# sin abrir los archivos.
+#
+# Las filas se leen todas al empezar y los veredictos nuevos se escriben
+# juntos al terminar, así los hilos del motor nunca tocan la base de datos.
+#
+# Cada validación total ("modules" / "files") tiene su ámbito: al terminar
+# completa se borran las filas de su ámbito que no ha visto (archivos
+# eliminados, módulos que ya no están), sin tocar las del otro.
+#
+# Con backup_verify_content (verify_content=True) no se fía de los pares
+# cuyo mtime es reciente respecto a cuándo se compararon: un cambio dentro
+# de la resolución del mtime no se notaría, así que se vuelven a comparar.
+
+CACHE_DIR = os.path.join("data", "validation_cache")
+CACHE_VERSION = 2
+
+
+def cache_path(profile_name):
+    return os.path.join(CACHE_DIR, f"{profile_name}.sqlite")
+
+
+def cache_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+class ValidationCache:
+    def __init__(self, profile_name, scope, verify_content=False):
+        self.path = cache_path(profile_name)
+        self.scope = scope
+        self.verify_content = verify_content
+        self._lock = threading.Lock()
+        self._verdicts = self._load()
+        self._pending = {}
+        self._seen = set()
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+                conn.executescript(f"""
+                    DROP TABLE IF EXISTS pairs;
+                    CREATE TABLE pairs (
+                        scope TEXT NOT NULL,
+                        path TEXT NOT NULL,
+                        backup TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        backup_size INTEGER NOT NULL,
+                        backup_mtime_ns INTEGER NOT NULL,
+                        equal INTEGER NOT NULL,
+                        checked_ns INTEGER NOT NULL,
+                        PRIMARY KEY (scope, path, backup)
+                    );
+                    PRAGMA user_version = {CACHE_VERSION};
+                """)
+        except sqlite3.Error:
+            # Sin cerrar, Windows no deja borrar el archivo corrupto
+            conn.close()
+            raise
+        return conn
+
+    def _load(self):
+        if not os.path.isfile(self.path):
+            return {}
+
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT path, backup, size, mtime_ns, backup_size, "
+                    "backup_mtime_ns, equal, checked_ns FROM pairs WHERE scope = ?",
+                    (self.scope,)
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.OperationalError:
+            # Bloqueada por otra validación: esta vez se compara todo
+            return {}
+        except sqlite3.Error:
+            # Caché corrupta: se borra y se reconstruye al guardar
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            return {}
+
+        return {(row[0], row[1]): row[2:] for row in rows}
+
+    # ------------------------------
+    # Consulta / registro (desde los hilos del motor)
+    # ------------------------------
+    def lookup(self, path, backup_path, stat, backup_stat):
+        """
+        True/False si el par no ha cambiado desde la última comparación,
+        None si hay que comparar. stat = (tamaño, mtime_ns).
+        """
+        key = (cache_key(path), cache_key(backup_path))
+        with self._lock:
+            self._seen.add(key)
+            record = self._pending.get(key) or self._verdicts.get(key)
+
+        if record is None or record[:4] != stat + backup_stat:
+            return None
+        if self.verify_content and self._is_recent(record):
+            return None
+        return bool(record[4])
+
+    def store(self, path, backup_path, stat, backup_stat, equal):
+        key = (cache_key(path), cache_key(backup_path))
+        with self._lock:
+            self._seen.add(key)
+            self._pending[key] = stat + backup_stat + (int(equal), time.time_ns())
+
+    @staticmethod
+    def _is_recent(record):
+        # Modificado poco antes (o después) de compararlo
+        checked_ns = record[5]
+        return max(record[1], record[3]) + MTIME_TOLERANCE_NS > checked_ns
+
+    # ------------------------------
+    # Escribir los veredictos nuevos
+    # ------------------------------
+    def save(self, prune=False):
+        """
+        Escribe los veredictos nuevos. Con prune=True (validación completa,
+        no cancelada) borra además las filas del ámbito que no se han visto.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._verdicts.update(pending)
+
+            stale = []
+            if prune:
+                stale = [key for key in self._verdicts if key not in self._seen]
+                for key in stale:
+                    del self._verdicts[key]
+
+        if not pending and not stale:
+            return
+
+        # La caché es solo una optimización: si no se puede escribir (base de
+        # datos bloqueada, carpeta de solo lectura) se pierde y ya
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "DELETE FROM pairs WHERE scope = ? AND path = ? AND backup = ?",
+                        [(self.scope,) + key for key in stale]
+                    )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO pairs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(self.scope,) + key + record for key, record in pending.items()]
+                    )
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            pass
@@ -1,18 +1,15 @@
 import sys
-import json
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 from ui.ui_main_qt import ModToolAppQt
+from core.config import modules_config, files_config
 
 
 class AppQt:
     def __init__(self):
-        # Cargar módulos
-        with open("data/modules.json", "r", encoding="utf-8") as f:
-            self.modules = json.load(f)
-
-        # Cargar archivos concretos
-        with open("data/files.json", "r", encoding="utf-8") as f:
-            self.files = json.load(f)
+        # Cargar módulos y archivos concretos (caché compartida con la ventana)
+        self.modules = modules_config.get()
+        self.files = files_config.get()
 
         self.current_profile = None
 
@@ -34,4 +31,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necesario para el ProcessPoolExecutor en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
     main()
@@ -3,24 +3,28 @@ import re
 import os
 import json
 import hashlib
-from PIL import Image
-from map.map_types import SEA, LAKE, RIVER, IMPASSABLE, LAND, UNKNOWN
+import numpy as np
+from map.map_raster import MapRaster
+from map.province_table import ProvinceTable
+from map.map_registry import get_shared, file_fingerprint, folder_fingerprint
 
 
 class MapLoader:
     def __init__(self, find_file_func):
         self.find_file = find_file_func
 
-        self.province_by_color = {}
         self.sea = set()
         self.lakes = set()
         self.rivers = set()
         self.impassable = set()
         self.impassable_seas = set()
         self.lut = None
+        self.raster = None
+
+        # provincias (struct-of-arrays indexado por pid)
+        self.province_table = None
 
         # mapas de títulos
-        self.provinces = {}            # pid → info
         self.province_to_barony = {}    # pid → b_*
         self.barony_to_county = {}      # b_* → c_*
 
@@ -41,24 +45,12 @@ class MapLoader:
         # Cargar colores del provinces.png
         self.load_all_colors()
 
-        # Cargar definition.csv
+        # Cargar definition.csv (+ colores del PNG sin definir como UNKNOWN)
         self.load_definition()
 
         # NUEVO: cargar landed_titles para b_* → c_* y province = X
         self.load_landed_titles()
 
-        # Crear mapa color → ID de provincia
-        self.color_to_province_id = {}
-        for prov in self.provinces.values():
-            r, g, b = prov["color"]
-            color = (r << 16) | (g << 8) | b
-            self.color_to_province_id[color] = prov["id"]
-
-        #print("TEST color_to_province_id size:", len(self.color_to_province_id))
-
-        # Marcar colores no definidos como UNKNOWN
-        self.mark_unknown_colors()
-
         # Cargar default.map
         self.load_default_map()
 
@@ -69,20 +61,16 @@ class MapLoader:
     # Leer todos los colores del provinces.png
     # ------------------------------
     def load_all_colors(self):
-        img = Image.open(self.provinces_png_path).convert("RGB")
-        pixels = img.load()
-
-        self.all_colors_in_png = set()
-
-        for y in range(img.height):
-            for x in range(img.width):
-                self.all_colors_in_png.add(pixels[x, y])
+        # Único decodificado del PNG: el viewer y el renderer reutilizan self.raster
+        # (compartido con otras vistas que resuelvan el mismo provinces.png)
+        png = self.provinces_png_path
+        self.raster = get_shared("raster", file_fingerprint(png), lambda: MapRaster(png))
 
     # ------------------------------
     # Cargar definition.csv
     # ------------------------------
     def load_definition(self):
-        self.provinces = {}
+        rows = {}   # pid → (r, g, b, name)
 
         with open(self.definition_path, "r", encoding="utf-8") as f:
             for line in f:
@@ -108,20 +96,15 @@ class MapLoader:
                 if pid == 0:
                     continue
 
-                self.provinces[pid] = {
-                    "id": pid,
-                    "color": (r, g, b),
-                    "name": name,
-                    "type": None,
-                }
-
-                self.province_by_color[(r, g, b)] = self.provinces[pid]
+                rows[pid] = (r, g, b, name)
 
                 # Si el nombre es una baronía
                 if name.startswith("b_"):
                     self.province_to_barony[pid] = name
 
-        #print("TEST provinces loaded:", len(self.provinces))
+        self.province_table = ProvinceTable(rows, self.raster.unique_colors())
+
+        #print("TEST provinces loaded:", len(self.province_table))
 
     # ------------------------------
     # Cargar landed_titles → b_* → c_* y province = X
@@ -199,19 +182,6 @@ class MapLoader:
             process_folder(mod_root)
 
 
-    # ------------------------------
-    # Marcar colores no definidos como UNKNOWN
-    # ------------------------------
-    def mark_unknown_colors(self):
-        for color in self.all_colors_in_png:
-            if color not in self.province_by_color:
-                self.province_by_color[color] = {
-                    "id": None,
-                    "color": color,
-                    "name": "UNKNOWN",
-                    "type": UNKNOWN,
-                }
-
     # ------------------------------
     # Cargar default.map (LIST + RANGE)
     # ------------------------------
@@ -258,34 +228,13 @@ class MapLoader:
         #print("TEST lakes:", len(self.lakes))
         #print("TEST rivers:", len(self.rivers))
 
-        in_default = (
-            self.sea
-            | self.lakes
-            | self.rivers
-            | self.impassable
-            | self.impassable_seas
+        self.province_table.classify(
+            self.sea,
+            self.lakes,
+            self.rivers,
+            self.impassable | self.impassable_seas,
         )
 
-        for (r, g, b), info in self.province_by_color.items():
-            pid = info["id"]
-
-            if pid is None:
-                info["type"] = UNKNOWN
-                continue
-
-            if pid in self.sea:
-                info["type"] = SEA
-            elif pid in self.lakes:
-                info["type"] = LAKE
-            elif pid in self.rivers:
-                info["type"] = RIVER
-            elif pid in self.impassable or pid in self.impassable_seas:
-                info["type"] = IMPASSABLE
-            elif pid not in in_default:
-                info["type"] = LAND
-            else:
-                info["type"] = UNKNOWN
-
     # ------------------------------
     # Hash de archivo
     # ------------------------------
@@ -302,6 +251,15 @@ class MapLoader:
     # Construir o cargar LUT
     # ------------------------------
     def build_or_load_lut(self):
+        # La LUT (16 MB) se comparte entre vistas con los mismos map_data
+        key = (
+            file_fingerprint(self.provinces_png_path),
+            file_fingerprint(self.definition_path),
+            file_fingerprint(self.default_map_path),
+        )
+        self.lut = get_shared("lut", key, self._build_or_load_lut_array)
+
+    def _build_or_load_lut_array(self):
         base_dir = os.path.dirname(self.definition_path)
         cache_dir = os.path.join(base_dir, "ck3_map_cache")
         os.makedirs(cache_dir, exist_ok=True)
@@ -318,17 +276,16 @@ class MapLoader:
                 if meta.get("definition_hash") == def_hash and meta.get("default_map_hash") == map_hash:
                     data = open(lut_bin_path, "rb").read()
                     if len(data) == 16_777_216:
-                        self.lut = bytearray(data)
                         print("LUT cargada desde caché")
-                        return
+                        return np.frombuffer(data, dtype=np.uint8)
             except:
                 pass
 
         print("Construyendo LUT nueva...")
-        self.lut = self._build_lut_in_memory()
+        lut = self._build_lut_in_memory()
 
         with open(lut_bin_path, "wb") as f:
-            f.write(self.lut)
+            f.write(lut)
 
         with open(lut_meta_path, "w", encoding="utf-8") as f:
             json.dump(
@@ -342,42 +299,27 @@ class MapLoader:
 
         print("LUT guardada en caché")
 
+        # Solo lectura: la LUT es compartida
+        lut.flags.writeable = False
+        return lut
+
     # ------------------------------
     # Construir LUT en memoria
     # ------------------------------
     def _build_lut_in_memory(self):
-        lut = bytearray(16_777_216)
-
-        for (r, g, b), info in self.province_by_color.items():
-            cid = (r << 16) | (g << 8) | b
-            t = info["type"]
-
-            if t == SEA:
-                lut[cid] = 1
-            elif t == LAKE:
-                lut[cid] = 2
-            elif t == RIVER:
-                lut[cid] = 3
-            elif t == IMPASSABLE:
-                lut[cid] = 4
-            elif t == LAND:
-                lut[cid] = 0
-            elif t == UNKNOWN:
-                lut[cid] = 5
-
-        return lut
+        return self.province_table.build_type_lut()
 
     # ------------------------------
     # Obtener provincia por color
     # ------------------------------
     def get_province_from_color(self, r, g, b):
-        return self.province_by_color.get((r, g, b), None)
+        return self.province_table.get_by_color(r, g, b)
 
     # ------------------------------
     # Obtener provincia por ID
     # ------------------------------
     def get_province_from_id(self, pid):
-        return self.provinces.get(pid)
+        return self.province_table.get(pid)
 
     # ------------------------------
     # NUEVO: título desde provincia
@@ -399,3 +341,25 @@ class MapLoader:
         if not barony:
             return None
         return self.get_county_from_barony(barony)
+
+
+# ---------------------------------------------------------
+# MapLoader compartido entre vistas con las mismas entradas
+# ---------------------------------------------------------
+def get_shared_map_loader(find_file):
+    """
+    Devuelve un MapLoader inmutable compartido por todas las vistas cuyos
+    map_data/* y common/landed_titles/ resuelven a los mismos archivos con el
+    mismo contenido. Si solo cambia landed_titles, se construye un loader
+    nuevo, pero el raster y la LUT se siguen compartiendo.
+    """
+    landed_titles = find_file("common/landed_titles/00_landed_titles.txt")
+
+    key = (
+        file_fingerprint(find_file("map_data/definition.csv")),
+        file_fingerprint(find_file("map_data/default.map")),
+        file_fingerprint(find_file("map_data/provinces.png")),
+        folder_fingerprint(os.path.dirname(landed_titles) if landed_titles else None),
+    )
+
+    return get_shared("map_loader", key, lambda: MapLoader(find_file))
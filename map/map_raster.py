@@ -0,0 +1,44 @@
+import numpy as np
+from PIL import Image
+
+
+class MapRaster:
+    """
+    provinces.png decodificado una sola vez.
+
+    - packed: array plano (w * h) uint32 con el color 0xRRGGBB de cada píxel
+    - El mismo buffer lo usan MapLoader, el province_id_map y el renderer
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+        img = Image.open(path).convert("RGB")
+        self.width, self.height = img.size
+
+        rgb = np.asarray(img)
+        img.close()
+
+        packed = rgb[:, :, 0].astype(np.uint32)
+        packed <<= 8
+        packed |= rgb[:, :, 1]
+        packed <<= 8
+        packed |= rgb[:, :, 2]
+        del rgb
+
+        self.packed = packed.ravel()
+        self._unique_colors = None
+
+    # ------------------------------
+    # Colores distintos (uint32 ordenados)
+    # ------------------------------
+    def unique_colors(self):
+        if self._unique_colors is None:
+            self._unique_colors = np.unique(self.packed)
+        return self._unique_colors
+
+    # ------------------------------
+    # Vista 2D (h, w) del buffer
+    # ------------------------------
+    def packed_2d(self):
+        return self.packed.reshape(self.height, self.width)
@@ -0,0 +1,105 @@
+import os
+import hashlib
+import threading
+import weakref
+
+
+# ---------------------------------------------------------
+# Registro de objetos de mapa compartidos entre vistas
+# ---------------------------------------------------------
+# Las vistas base y mod suelen resolver los mismos map_data/*. Los objetos
+# pesados (MapRaster, LUT, MapLoader, capas) se guardan por (tipo, clave) y se
+# reutilizan mientras alguna vista los tenga vivos. Son inmutables una vez
+# construidos; nadie debe modificarlos.
+
+_lock = threading.Lock()
+_entries = weakref.WeakValueDictionary()    # (tipo, clave) → objeto
+_build_locks = {}                           # (tipo, clave) → Lock de construcción
+_hash_memo = {}                             # ruta → (tamaño, mtime_ns, md5), solo la última
+
+
+# ---------------------------------------------------------
+# Hash de archivo memorizado por (tamaño, mtime)
+# ---------------------------------------------------------
+def cached_file_hash(path):
+    if not path or not os.path.isfile(path):
+        return None
+
+    st = os.stat(path)
+    memo_key = os.path.normcase(os.path.abspath(path))
+    stamp = (st.st_size, st.st_mtime_ns)
+
+    with _lock:
+        memo = _hash_memo.get(memo_key)
+    if memo is not None and memo[:2] == stamp:
+        return memo[2]
+
+    # Se calcula fuera del lock; una versión nueva del archivo sustituye a la anterior
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+
+    with _lock:
+        _hash_memo[memo_key] = stamp + (digest,)
+
+    return digest
+
+
+# ---------------------------------------------------------
+# Huella de un archivo: ruta resuelta + hash del contenido
+# ---------------------------------------------------------
+def file_fingerprint(path):
+    if not path:
+        return None
+    return (os.path.normcase(os.path.abspath(path)), cached_file_hash(path))
+
+
+# ---------------------------------------------------------
+# Huella de todos los .txt de una carpeta
+# ---------------------------------------------------------
+def folder_fingerprint(folder, ext=".txt"):
+    if not folder or not os.path.isdir(folder):
+        return None
+
+    return tuple(
+        file_fingerprint(os.path.join(folder, fname))
+        for fname in sorted(os.listdir(folder))
+        if fname.endswith(ext)
+    )
+
+
+# ---------------------------------------------------------
+# Obtener (o construir una sola vez) un objeto compartido
+# ---------------------------------------------------------
+def get_shared(kind, key, factory):
+    """
+    Devuelve el objeto registrado para (kind, key) o lo construye con factory().
+    Si dos hilos piden la misma clave a la vez, solo uno lo construye.
+    factory() debe devolver un objeto que admita weakref.
+    """
+    full_key = (kind, key)
+
+    with _lock:
+        obj = _entries.get(full_key)
+        if obj is not None:
+            return obj
+        build_lock = _build_locks.setdefault(full_key, threading.Lock())
+
+    with build_lock:
+        with _lock:
+            obj = _entries.get(full_key)
+            if obj is not None:
+                return obj
+
+        try:
+            obj = factory()
+            with _lock:
+                _entries[full_key] = obj
+        finally:
+            # También si factory() falla: el siguiente intento crea su lock
+            with _lock:
+                _build_locks.pop(full_key, None)
+
+    return obj
@@ -4,3 +4,15 @@ RIVER = "river"
 IMPASSABLE = "impassable"
 LAND = "land"
 UNKNOWN = "unknown"
+
+# Código numérico de cada tipo (mismo valor que en la LUT)
+TYPE_CODES = {
+    LAND: 0,
+    SEA: 1,
+    LAKE: 2,
+    RIVER: 3,
+    IMPASSABLE: 4,
+    UNKNOWN: 5,
+}
+
+TYPE_BY_CODE = {code: name for name, code in TYPE_CODES.items()}
@@ -0,0 +1,188 @@
+import sys
+import numpy as np
+
+from map.map_types import SEA, LAKE, RIVER, IMPASSABLE, LAND, UNKNOWN, TYPE_CODES, TYPE_BY_CODE
+
+
+# ---------------------------------------------------------
+# Vista ligera de una provincia
+# ---------------------------------------------------------
+class ProvinceView:
+    """
+    Vista sobre una fila de ProvinceTable. Se puede leer como el dict antiguo:
+    province["id"], province["color"], province["name"], province["type"].
+    Para colores sin provincia (UNKNOWN) id es None.
+    """
+
+    __slots__ = ("table", "id", "_color")
+
+    def __init__(self, table, pid, color=None):
+        self.table = table
+        self.id = pid
+        self._color = color
+
+    @property
+    def color(self):
+        if self.id is None:
+            return self._color
+        t = self.table
+        return (int(t.r[self.id]), int(t.g[self.id]), int(t.b[self.id]))
+
+    @property
+    def name(self):
+        if self.id is None:
+            return "UNKNOWN"
+        return self.table.names[self.id]
+
+    @property
+    def type(self):
+        if self.id is None:
+            return UNKNOWN
+        return TYPE_BY_CODE[int(self.table.type_code[self.id])]
+
+    def __getitem__(self, key):
+        if key not in ("id", "color", "name", "type"):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"ProvinceView(id={self.id}, name={self.name!r}, type={self.type!r})"
+
+
+# ---------------------------------------------------------
+# Tabla de provincias indexada por ID (struct-of-arrays)
+# ---------------------------------------------------------
+class ProvinceTable:
+    """
+    - r, g, b, type_code: arrays indexados por pid (el 0 no se usa)
+    - names: lista indexada por pid, con los nombres internados
+    - color_keys / color_pids: índice ordenado color 0xRRGGBB → pid
+      (pid 0 para colores del PNG que no están en definition.csv)
+    """
+
+    def __init__(self, rows, png_colors=None):
+        """
+        rows: dict pid → (r, g, b, name), en orden de definition.csv
+        png_colors: colores empaquetados presentes en provinces.png
+        """
+        size = (max(rows) if rows else 0) + 1
+
+        self.defined = np.zeros(size, dtype=bool)
+        self.r = np.zeros(size, dtype=np.uint8)
+        self.g = np.zeros(size, dtype=np.uint8)
+        self.b = np.zeros(size, dtype=np.uint8)
+        self.type_code = np.full(size, TYPE_CODES[UNKNOWN], dtype=np.uint8)
+        self.names = [None] * size
+
+        pids = np.fromiter(rows.keys(), dtype=np.int64, count=len(rows))
+        rgb = np.array([row[:3] for row in rows.values()], dtype=np.uint8).reshape(-1, 3)
+
+        self.defined[pids] = True
+        self.r[pids] = rgb[:, 0]
+        self.g[pids] = rgb[:, 1]
+        self.b[pids] = rgb[:, 2]
+
+        for pid, (_, _, _, name) in rows.items():
+            self.names[pid] = sys.intern(name)
+
+        self.is_barony = np.array(
+            [bool(name) and name.startswith("b_") for name in self.names],
+            dtype=bool,
+        )
+
+        # Índice de color: si dos provincias comparten color gana la última
+        keys = (
+            (rgb[:, 0].astype(np.uint32) << 16)
+            | (rgb[:, 1].astype(np.uint32) << 8)
+            | rgb[:, 2]
+        )
+        last = keys.size - 1 - np.unique(keys[::-1], return_index=True)[1]
+        keys = keys[last]
+        key_pids = pids[last]
+
+        # Colores del PNG sin provincia → pid 0 (UNKNOWN)
+        if png_colors is not None:
+            unknown = np.setdiff1d(png_colors, keys, assume_unique=True)
+            keys = np.concatenate([keys, unknown.astype(np.uint32)])
+            key_pids = np.concatenate([key_pids, np.zeros(unknown.size, dtype=np.int64)])
+
+        order = np.argsort(keys)
+        self.color_keys = keys[order]
+        self.color_pids = key_pids[order].astype(np.int32)
+
+    def __len__(self):
+        return int(self.defined.sum())
+
+    # ------------------------------
+    # Clasificar tipos desde default.map
+    # ------------------------------
+    def classify(self, sea, lakes, rivers, impassable):
+        """
+        Igual que el if/elif original: mar > lago > río > impassable > tierra.
+        """
+        codes = np.full(self.defined.size, TYPE_CODES[LAND], dtype=np.uint8)
+
+        for pid_set, type_name in (
+            (impassable, IMPASSABLE),
+            (rivers, RIVER),
+            (lakes, LAKE),
+            (sea, SEA),
+        ):
+            pids = np.fromiter(pid_set, dtype=np.int64, count=len(pid_set))
+            pids = pids[(pids > 0) & (pids < codes.size)]
+            codes[pids] = TYPE_CODES[type_name]
+
+        codes[~self.defined] = TYPE_CODES[UNKNOWN]
+        self.type_code = codes
+
+    # ------------------------------
+    # Búsquedas
+    # ------------------------------
+    def get(self, pid):
+        if pid is None or not (0 < pid < self.defined.size) or not self.defined[pid]:
+            return None
+        return ProvinceView(self, int(pid))
+
+    def pid_from_color(self, packed):
+        """
+        Devuelve el pid del color, 0 si está en el PNG sin provincia, None si no existe.
+        """
+        i = int(np.searchsorted(self.color_keys, packed))
+        if i < self.color_keys.size and self.color_keys[i] == packed:
+            return int(self.color_pids[i])
+        return None
+
+    def get_by_color(self, r, g, b):
+        pid = self.pid_from_color((r << 16) | (g << 8) | b)
+        if pid is None:
+            return None
+        if pid == 0:
+            return ProvinceView(self, None, (r, g, b))
+        return ProvinceView(self, pid)
+
+    # ------------------------------
+    # Consultas masivas
+    # ------------------------------
+    def pids_of_type(self, type_name):
+        return np.flatnonzero(self.defined & (self.type_code == TYPE_CODES[type_name]))
+
+    def barony_pids(self):
+        return np.flatnonzero(self.is_barony)
+
+    # ------------------------------
+    # LUT color → código de tipo (16 MB)
+    # ------------------------------
+    def build_type_lut(self):
+        lut = np.zeros(16_777_216, dtype=np.uint8)
+        lut[self.color_keys] = np.where(
+            self.color_pids > 0,
+            self.type_code[self.color_pids],
+            TYPE_CODES[UNKNOWN],
+        )
+        return lut
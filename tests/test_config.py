@@ -0,0 +1,54 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from core.config import ConfigFile
+
+
+class ConfigFileCopiesTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "data", "modules.json")
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"CK3": {"events": {"path": "events"}}}, f)
+
+        self.config = ConfigFile(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_get_returns_independent_copies(self):
+        first = self.config.get()
+        first["CK3"]["events"]["path"] = "editado"
+
+        # Segunda llamada: acierto de caché
+        second = self.config.get()
+        self.assertEqual(second["CK3"]["events"]["path"], "events")
+        self.assertIsNot(second, self.config.get())
+
+    def test_failed_save_leaves_cache_untouched(self):
+        data = self.config.get()
+        data["CK3"]["nuevo"] = {"path": "common/nuevo"}
+
+        with mock.patch("core.config.os.replace", side_effect=OSError("disco lleno")):
+            with self.assertRaises(OSError):
+                self.config.save(data)
+
+        self.assertNotIn("nuevo", self.config.get()["CK3"])
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["modules.json"])
+
+    def test_saved_data_is_not_shared_with_caller(self):
+        data = self.config.get()
+        data["CK3"]["nuevo"] = {"path": "common/nuevo"}
+        self.config.save(data)
+
+        data["CK3"]["nuevo"]["path"] = "sin guardar"
+        self.assertEqual(self.config.get()["CK3"]["nuevo"]["path"], "common/nuevo")
+
+
+if __name__ == "__main__":
+    unittest.main()
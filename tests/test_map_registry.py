@@ -0,0 +1,52 @@
+import gc
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt6.QtGui import QImage
+from PyQt6.QtWidgets import QApplication
+
+from map.map_registry import get_shared
+from ui.history.viewer import MapViewerQt
+
+
+class FakeLayers:
+    def __init__(self):
+        self.raster = None
+        self.w = self.h = 4
+        self.province_id_map = np.zeros(16, dtype=np.int32)
+        self.province_index = None
+        self.base_image = QImage(2, 2, QImage.Format.Format_ARGB32)
+
+
+class SharedLayersTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_viewer_keeps_shared_layers_alive(self):
+        key = ("test", id(self))
+        built = []
+
+        def factory():
+            built.append(1)
+            return FakeLayers()
+
+        layers = get_shared("map_layers", key, factory)
+        viewer = MapViewerQt("provinces.png", map_loader=None, layers=layers)
+
+        # Como on_load_finished: el resultado del worker se descarta
+        first_id = id(layers)
+        del layers
+        gc.collect()
+
+        again = get_shared("map_layers", key, factory)
+        self.assertEqual(id(again), first_id)
+        self.assertEqual(len(built), 1)
+        self.assertIs(viewer.layers, again)
+
+
+if __name__ == "__main__":
+    unittest.main()
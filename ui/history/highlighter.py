@@ -1,27 +1,121 @@
+import numpy as np
 from PyQt6.QtGui import QImage
 from PyQt6.QtCore import Qt
 
 
-def generate_highlight_half_from_idmap(province_id_map, w: int, h: int, target_id: int):
-    highlight_hd = bytearray(w * h * 4)
+# ============================================================
+# Índice de tramos por provincia (bounding box + spans por fila)
+# ============================================================
+class ProvinceSpanIndex:
+    """
+    Se construye una vez desde el province_id_map:
+    - bbox de cada provincia (x0, y0, x1, y1) en píxeles HD, x1/y1 exclusivos
+    - tramos horizontales (y, x_inicio, x_fin) de cada provincia
+    """
+
+    def __init__(self, province_id_map, w: int, h: int):
+        ids = np.asarray(province_id_map).reshape(h, w)
+
+        # Un tramo empieza en la columna 0 o donde cambia el ID
+        change = np.empty((h, w), dtype=bool)
+        change[:, 0] = True
+        np.not_equal(ids[:, 1:], ids[:, :-1], out=change[:, 1:])
+        starts = np.flatnonzero(change)
+        del change
+
+        ends = np.empty_like(starts)
+        ends[:-1] = starts[1:]
+        ends[-1] = w * h
+
+        run_pid = ids.ravel()[starts]
+        keep = run_pid != 0
+        starts = starts[keep]
+        ends = ends[keep]
+        run_pid = run_pid[keep]
+
+        # Agrupar tramos por provincia (estable: dentro de cada grupo, y creciente)
+        order = np.argsort(run_pid, kind="stable")
+        run_pid = run_pid[order]
+        starts = starts[order]
+        ends = ends[order]
+
+        run_y = starts // w
+        self.run_y = run_y.astype(np.int32)
+        self.run_x0 = (starts - run_y * w).astype(np.int32)
+        self.run_x1 = (ends - run_y * w).astype(np.int32)
+
+        self.pids, first = np.unique(run_pid, return_index=True)
+        self.offsets = np.append(first, run_pid.size)
+
+        if self.pids.size:
+            self.bbox_x0 = np.minimum.reduceat(self.run_x0, first)
+            self.bbox_x1 = np.maximum.reduceat(self.run_x1, first)
+        else:
+            self.bbox_x0 = self.bbox_x1 = np.zeros(0, dtype=np.int32)
+        self.bbox_y0 = self.run_y[first]
+        self.bbox_y1 = self.run_y[self.offsets[1:] - 1] + 1
+
+    def _find(self, pid):
+        i = int(np.searchsorted(self.pids, pid))
+        if i < self.pids.size and self.pids[i] == pid:
+            return i
+        return None
+
+    def bbox(self, pid):
+        i = self._find(pid)
+        if i is None:
+            return None
+        return (
+            int(self.bbox_x0[i]), int(self.bbox_y0[i]),
+            int(self.bbox_x1[i]), int(self.bbox_y1[i]),
+        )
+
+    def spans(self, pid):
+        i = self._find(pid)
+        if i is None:
+            return None
+        a, b = self.offsets[i], self.offsets[i + 1]
+        return self.run_y[a:b], self.run_x0[a:b], self.run_x1[a:b]
+
+
+# ============================================================
+# Resaltado HALF limitado al bbox de la provincia
+# ============================================================
+def generate_highlight_half_for_province(index: ProvinceSpanIndex, target_id: int):
+    """
+    Devuelve (QImage HALF, (x, y)) con la posición en coordenadas de escena,
+    o None si la provincia no aparece en el mapa.
+    """
+    bbox = index.bbox(target_id)
+    if bbox is None:
+        return None
+
+    x0, y0, x1, y1 = bbox
+
+    # Alinear a pares para que la reducción ×2 cuadre con el mapa base
+    x0 -= x0 % 2
+    y0 -= y0 % 2
+    x1 += x1 % 2
+    y1 += y1 % 2
+
+    bw = x1 - x0
+    bh = y1 - y0
+
+    highlight_hd = np.zeros((bh, bw, 4), dtype=np.uint8)
 
     hr, hg, hb, ha = 255, 255, 0, 120
+    color = (hb, hg, hr, ha)
 
-    for idx in range(w * h):
-        if province_id_map[idx] == target_id:
-            k = idx * 4
-            highlight_hd[k] = hb
-            highlight_hd[k+1] = hg
-            highlight_hd[k+2] = hr
-            highlight_hd[k+3] = ha
+    for y, a, b in zip(*(s.tolist() for s in index.spans(target_id))):
+        highlight_hd[y - y0, a - x0:b - x0] = color
 
-    qimg_hd = QImage(highlight_hd, w, h, w * 4, QImage.Format.Format_ARGB32)
+    qimg_hd = QImage(highlight_hd.data, bw, bh, bw * 4, QImage.Format.Format_ARGB32)
 
     qimg_half = qimg_hd.scaled(
-        w // 2,
-        h // 2,
+        bw // 2,
+        bh // 2,
         Qt.AspectRatioMode.IgnoreAspectRatio,
         Qt.TransformationMode.SmoothTransformation
     )
 
-    return qimg_half
+    return qimg_half, (x0 // 2, y0 // 2)
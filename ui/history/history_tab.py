@@ -1,12 +1,27 @@
 import os
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout
+    QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QProgressBar
 )
+from PyQt6.QtCore import QThreadPool
 
-from map.map_loader import MapLoader
 from .viewer import MapViewerQt
+from .map_worker import MapLoadWorker
 
-from ui.history.title_history_loader import load_all_title_history, get_holder_at_year
+from ui.history.title_history_loader import get_holder_at_year
+
+
+# ---------------------------------------------------------
+# find_file sobre una lista de raíces (la primera que tenga el archivo)
+# ---------------------------------------------------------
+def make_find_file(roots):
+    def find_file(relative_path):
+        for root in roots:
+            full = os.path.join(root, relative_path)
+            if os.path.isfile(full):
+                return full
+        return None
+
+    return find_file
 
 
 class HistoryTabQt(QWidget):
@@ -19,30 +34,11 @@ class HistoryTabQt(QWidget):
         self.map_loader = None
         self.title_history = {}
 
-        self.build_ui()
-
-    # ---------------------------------------------------------
-    # FIND_FILE según la vista
-    # ---------------------------------------------------------
-    def find_file_base(self, relative_path):
-        game_root = self.app.current_profile["game_root"]
-        full = os.path.join(game_root, relative_path)
-        return full if os.path.isfile(full) else None
+        # Carga en segundo plano: solo se acepta el resultado de la última generación
+        self.load_generation = 0
+        self.load_workers = {}      # generación → MapLoadWorker en curso
 
-    def find_file_mod(self, relative_path):
-        profile = self.app.current_profile
-        mod_root = profile["mod_root"]
-        game_root = profile["game_root"]
-
-        mod_path = os.path.join(mod_root, relative_path)
-        if os.path.isfile(mod_path):
-            return mod_path
-
-        game_path = os.path.join(game_root, relative_path)
-        if os.path.isfile(game_path):
-            return game_path
-
-        return None
+        self.build_ui()
 
     # ---------------------------------------------------------
     # UI
@@ -87,6 +83,11 @@ class HistoryTabQt(QWidget):
         self.map_layout = QVBoxLayout(self.map_container)
         self.map_layout.addLayout(btn_row)
 
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.hide()
+        self.map_layout.addWidget(self.progress_bar)
+
         # Layout principal
         main_row = QHBoxLayout()
         main_row.addWidget(self.info_panel)
@@ -104,23 +105,32 @@ class HistoryTabQt(QWidget):
     # REFRESH según la vista
     # ---------------------------------------------------------
     def refresh(self):
+        # Un refresh nuevo invalida cualquier carga anterior
+        self.cancel_loading()
+
         if self.viewer:
             self.viewer.setParent(None)
             self.viewer = None
 
+        self.map_loader = None
+        self.title_history = {}
+
         profile = self.app.current_profile
+        if not profile:
+            return
+
         game_root = profile["game_root"]
         mod_root = profile["mod_root"]
 
-        # Vista BASE
+        # Vista BASE (las rutas se fijan ahora: el perfil puede cambiar durante la carga)
         if self.mode == "base":
-            find_file = self.find_file_base
+            find_file = make_find_file([game_root])
             history_root = game_root
             self.info_label.setText("Vista: Juego Base")
 
         # Vista MOD
         else:
-            find_file = self.find_file_mod
+            find_file = make_find_file([mod_root, game_root])
             history_root = mod_root
             self.info_label.setText("Vista: Mod")
 
@@ -130,20 +140,61 @@ class HistoryTabQt(QWidget):
             self.info_label.setText("No se encontró provinces.png")
             return
 
-        self.map_loader = MapLoader(find_file)
+        self.load_generation += 1
+        worker = MapLoadWorker(self.load_generation, find_file, path, history_root)
+        worker.signals.progress.connect(self.on_load_progress)
+        worker.signals.finished.connect(self.on_load_finished)
+        worker.signals.failed.connect(self.on_load_failed)
+        self.load_workers[self.load_generation] = worker
+
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
 
-        # Cargar historia de títulos
-        self.title_history = load_all_title_history(history_root)
+        QThreadPool.globalInstance().start(worker)
+
+    # ---------------------------------------------------------
+    # CARGA EN SEGUNDO PLANO
+    # ---------------------------------------------------------
+    def cancel_loading(self):
+        for worker in self.load_workers.values():
+            worker.cancel()
+        self.progress_bar.hide()
+
+    def on_load_progress(self, generation, percent, message):
+        if generation != self.load_generation:
+            return
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"{message} %p%")
 
-        # Crear viewer
-        self.viewer = MapViewerQt(path, self.map_loader)
+    def on_load_finished(self, generation, result):
+        self.load_workers.pop(generation, None)
+
+        if generation != self.load_generation or result is None:
+            return
+
+        self.progress_bar.hide()
+
+        self.map_loader = result["map_loader"]
+        self.title_history = result["title_history"]
+
+        # Crear viewer (en el hilo de la GUI, con las capas ya calculadas)
+        self.viewer = MapViewerQt(result["image_path"], self.map_loader, result["layers"])
         self.viewer.province_clicked.connect(self.update_province_info)
         self.map_layout.addWidget(self.viewer)
 
+    def on_load_failed(self, generation, message):
+        self.load_workers.pop(generation, None)
+
+        if generation != self.load_generation:
+            return
+
+        self.progress_bar.hide()
+        self.info_label.setText(f"Error cargando el mapa: {message}")
+
     # ---------------------------------------------------------
     # CLICK EN PROVINCIA
     # ---------------------------------------------------------
-    def update_province_info(self, province: dict):
+    def update_province_info(self, province):
         try:
             pid = province["id"]
             r, g, b = province["color"]
@@ -0,0 +1,86 @@
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from map.map_loader import get_shared_map_loader
+from map.map_registry import get_shared, file_fingerprint
+from .viewer import MapLayers
+from .title_history_loader import load_all_title_history
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+class MapLoadSignals(QObject):
+    progress = pyqtSignal(int, int, str)    # generación, porcentaje, mensaje
+    finished = pyqtSignal(int, object)      # generación, resultado (None si se canceló)
+    failed = pyqtSignal(int, str)           # generación, error
+
+
+# ---------------------------------------------------------
+# Carga del mapa en un hilo del QThreadPool
+# ---------------------------------------------------------
+class MapLoadWorker(QRunnable):
+    """
+    Construye MapLoader, la historia de títulos y las capas del mapa.
+    El resultado es un dict con map_loader, title_history, layers e image_path;
+    el MapViewerQt se crea después en el hilo de la GUI.
+    """
+
+    def __init__(self, generation, find_file, image_path, history_root):
+        super().__init__()
+        self.generation = generation
+        self.find_file = find_file
+        self.image_path = image_path
+        self.history_root = history_root
+
+        self.signals = MapLoadSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def check_cancelled(self):
+        if self._cancelled.is_set():
+            raise LoadCancelled()
+
+    def run(self):
+        gen = self.generation
+
+        try:
+            self.signals.progress.emit(gen, 5, "Cargando provinces.png, definition.csv y default.map…")
+            map_loader = get_shared_map_loader(self.find_file)
+            self.check_cancelled()
+
+            self.signals.progress.emit(gen, 45, "Leyendo history/titles…")
+            title_history = load_all_title_history(self.history_root)
+            self.check_cancelled()
+
+            self.signals.progress.emit(gen, 60, "Generando capas del mapa…")
+            # Las capas solo dependen de map_data: se comparten entre vistas
+            layers_key = (
+                file_fingerprint(self.image_path),
+                file_fingerprint(map_loader.definition_path),
+                file_fingerprint(map_loader.default_map_path),
+            )
+            layers = get_shared(
+                "map_layers",
+                layers_key,
+                lambda: MapLayers(self.image_path, map_loader, self.check_cancelled),
+            )
+            self.check_cancelled()
+
+            self.signals.progress.emit(gen, 100, "Mapa listo")
+            self.signals.finished.emit(gen, {
+                "map_loader": map_loader,
+                "title_history": title_history,
+                "layers": layers,
+                "image_path": self.image_path,
+            })
+
+        except LoadCancelled:
+            self.signals.finished.emit(gen, None)
+
+        except Exception as e:
+            self.signals.failed.emit(gen, str(e))
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+
+
+def pixmap_nbytes(pixmap):
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class PixmapLRUCache:
+    """
+    Caché LRU acotada por bytes de píxel, no por número de entradas.
+    - put(key, value, nbytes): expulsa las entradas más antiguas hasta caber
+    - get(key): devuelve el valor (o None) y lo marca como reciente
+    - stats(): contadores de aciertos, fallos y expulsiones
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max(0, int(max_bytes))
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()   # key → (value, nbytes)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, nbytes):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+
+        # Una entrada mayor que todo el presupuesto no se guarda
+        if nbytes > self.max_bytes:
+            return
+
+        self._entries[key] = (value, nbytes)
+        self.total_bytes += nbytes
+
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_bytes
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
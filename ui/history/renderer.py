@@ -1,85 +1,97 @@
+import numpy as np
 from PyQt6.QtGui import QImage
 from PyQt6.QtCore import Qt
 
 
 # ============================================================
-# GENERAR MAPA RECOLOREADO HALF (reducción ×2)
+# Paleta por tipo de la LUT (ya en BGR para Format_BGR888)
+# ============================================================
+TYPE_PALETTE_BGR = np.zeros((256, 3), dtype=np.uint8)
+TYPE_PALETTE_BGR[0] = (60, 180, 235)     # tierra
+TYPE_PALETTE_BGR[1] = (255, 120, 80)     # mar
+TYPE_PALETTE_BGR[2] = (230, 100, 60)     # lago
+TYPE_PALETTE_BGR[3] = (255, 150, 100)    # río
+TYPE_PALETTE_BGR[4] = (120, 120, 120)    # impassable
+# 5 (unknown) y cualquier otro valor → negro
+
+
+# ============================================================
+# Recolorear el raster con la LUT → buffer BGR888 (h, w, 3)
+# ============================================================
+def colorize_bgr(raster, lut):
+    types = np.frombuffer(lut, dtype=np.uint8)[raster.packed]
+    return TYPE_PALETTE_BGR[types].reshape(raster.height, raster.width, 3)
+
+
 # ============================================================
-def generate_colored_map_half(original_img, lut):
-    w = original_img.width()
-    h = original_img.height()
-
-    ptr = original_img.bits()
-    ptr.setsize(original_img.sizeInBytes())
-    data = bytes(ptr)
-
-    out = bytearray(w * h * 3)
-
-    for idx in range(w * h):
-        j4 = idx * 4
-        b = data[j4]
-        g = data[j4 + 1]
-        r = data[j4 + 2]
-
-        color = (r << 16) | (g << 8) | b
-        t = lut[color]
-        j3 = idx * 3
-
-        if t == 1:      # mar
-            out[j3] = 80; out[j3+1] = 120; out[j3+2] = 255
-        elif t == 2:    # lago
-            out[j3] = 60; out[j3+1] = 100; out[j3+2] = 230
-        elif t == 3:    # río
-            out[j3] = 100; out[j3+1] = 150; out[j3+2] = 255
-        elif t == 4:    # impassable
-            out[j3] = 120; out[j3+1] = 120; out[j3+2] = 120
-        elif t == 0:    # tierra
-            out[j3] = 235; out[j3+1] = 180; out[j3+2] = 60
-        else:
-            out[j3] = 0; out[j3+1] = 0; out[j3+2] = 0
-
-    # Convertir a BGR888
-    bgr = bytearray(len(out))
-    for i in range(0, len(out), 3):
-        bgr[i] = out[i+2]
-        bgr[i+1] = out[i+1]
-        bgr[i+2] = out[i]
-
-    qimg_hd = QImage(bgr, w, h, w * 3, QImage.Format.Format_BGR888)
-
-    # Reducir ×2 (HALF)
-    qimg_half = qimg_hd.scaled(
+# Bordes: píxeles cuyo vecino (4-conexión) es de otra región
+# ============================================================
+def border_mask(region_map):
+    """
+    region_map: array 2D (h, w). Devuelve una máscara bool del mismo tamaño.
+    Como el bucle original, la fila/columna exterior nunca es borde.
+    """
+    mask = np.zeros(region_map.shape, dtype=bool)
+
+    inner = region_map[1:-1, 1:-1]
+    mask[1:-1, 1:-1] = (
+        (inner != region_map[1:-1, :-2])
+        | (inner != region_map[1:-1, 2:])
+        | (inner != region_map[:-2, 1:-1])
+        | (inner != region_map[2:, 1:-1])
+    )
+
+    return mask
+
+
+# ============================================================
+# Reducir ×2 (HALF) un buffer BGR888
+# ============================================================
+def _scaled_half_bgr(bgr, w, h):
+    # QImage envuelve el buffer sin copiarlo; bgr debe seguir vivo hasta escalar
+    qimg_hd = QImage(bgr.data, w, h, w * 3, QImage.Format.Format_BGR888)
+
+    return qimg_hd.scaled(
         w // 2,
         h // 2,
         Qt.AspectRatioMode.IgnoreAspectRatio,
         Qt.TransformationMode.SmoothTransformation
     )
 
-    return qimg_half
+
+# ============================================================
+# GENERAR MAPA RECOLOREADO HALF (reducción ×2)
+# ============================================================
+def generate_colored_map_half(raster, lut):
+    bgr = colorize_bgr(raster, lut)
+    return _scaled_half_bgr(bgr, raster.width, raster.height)
 
 
 # ============================================================
 # GENERAR province_id_map (color → ID real)
 # ============================================================
-def generate_province_id_map(original_img, map_loader):
-    w = original_img.width()
-    h = original_img.height()
+def generate_province_id_map(raster, map_loader):
+    """
+    Devuelve un array plano (w * h) con el ID de provincia de cada píxel.
+    Los colores sin provincia en definition.csv quedan a 0.
+    """
+    packed = raster.packed
 
-    ptr = original_img.bits()
-    ptr.setsize(original_img.sizeInBytes())
-    data = bytes(ptr)
+    # Índice color → ID ya ordenado en la tabla de provincias
+    table = map_loader.province_table
+    keys = table.color_keys
+    ids = table.color_pids
 
-    province_id_map = [0] * (w * h)
-    color_to_id = map_loader.color_to_province_id
+    id_dtype = np.uint16 if ids.size == 0 or ids.max() <= np.iinfo(np.uint16).max else np.int32
 
-    for idx in range(w * h):
-        j4 = idx * 4
-        b = data[j4]
-        g = data[j4 + 1]
-        r = data[j4 + 2]
+    if keys.size == 0:
+        return np.zeros(packed.size, dtype=id_dtype)
 
-        color = (r << 16) | (g << 8) | b
-        province_id_map[idx] = color_to_id.get(color, 0)
+    pos = np.searchsorted(keys, packed)
+    np.minimum(pos, keys.size - 1, out=pos)
+
+    province_id_map = ids.astype(id_dtype)[pos]
+    province_id_map[keys[pos] != packed] = 0
 
     return province_id_map
 
@@ -87,82 +99,20 @@ def generate_province_id_map(original_img, map_loader):
 # ============================================================
 # Bordes
 # ============================================================
-def generate_base_map_half(original_img, lut, province_id_map=None):
-    w = original_img.width()
-    h = original_img.height()
-
-    # Leer RGBA del QImage
-    ptr = original_img.bits()
-    ptr.setsize(original_img.sizeInBytes())
-    data = bytes(ptr)
-
-    # Salida RGB
-    out = bytearray(w * h * 3)
-
-    # Si no se pasa province_id_map, lo generamos
-    if province_id_map is None:
-        # Import local para evitar dependencias circulares
-        from .renderer import generate_province_id_map
-        province_id_map = generate_province_id_map(original_img, lut)
+def generate_base_map_half(raster, lut, province_id_map=None):
+    w = raster.width
+    h = raster.height
 
     # 1. Pintar mapa base usando LUT
-    for idx in range(w * h):
-        j4 = idx * 4
-        b = data[j4]
-        g = data[j4 + 1]
-        r = data[j4 + 2]
-
-        color = (r << 16) | (g << 8) | b
-        t = lut[color]
-        j3 = idx * 3
-
-        if t == 1:      # mar
-            out[j3] = 80; out[j3+1] = 120; out[j3+2] = 255
-        elif t == 2:    # lago
-            out[j3] = 60; out[j3+1] = 100; out[j3+2] = 230
-        elif t == 3:    # río
-            out[j3] = 100; out[j3+1] = 150; out[j3+2] = 255
-        elif t == 4:    # impassable
-            out[j3] = 120; out[j3+1] = 120; out[j3+2] = 120
-        elif t == 0:    # tierra
-            out[j3] = 235; out[j3+1] = 180; out[j3+2] = 60
-        else:
-            out[j3] = 0; out[j3+1] = 0; out[j3+2] = 0
+    bgr = colorize_bgr(raster, lut)
 
     # 2. Dibujar bordes de provincia
-    for y in range(1, h - 1):
-        for x in range(1, w - 1):
-            idx = y * w + x
-            pid = province_id_map[idx]
-
-            # Comparar con vecinos
-            if (
-                pid != province_id_map[idx - 1] or
-                pid != province_id_map[idx + 1] or
-                pid != province_id_map[idx - w] or
-                pid != province_id_map[idx + w]
-            ):
-                j3 = idx * 3
-                out[j3] = 0
-                out[j3+1] = 0
-                out[j3+2] = 0
-
-    # Convertir a BGR888
-    bgr = bytearray(len(out))
-    for i in range(0, len(out), 3):
-        bgr[i] = out[i+2]
-        bgr[i+1] = out[i+1]
-        bgr[i+2] = out[i]
-
-    qimg_hd = QImage(bgr, w, h, w * 3, QImage.Format.Format_BGR888)
-
-    # Reducir ×2 (HALF)
-    qimg_half = qimg_hd.scaled(
-        w // 2,
-        h // 2,
-        Qt.AspectRatioMode.IgnoreAspectRatio,
-        Qt.TransformationMode.SmoothTransformation
-    )
+    # Sin province_id_map los bordes se calculan sobre el color del PNG
+    if province_id_map is None:
+        regions = raster.packed_2d()
+    else:
+        regions = np.asarray(province_id_map).reshape(h, w)
 
-    return qimg_half
+    bgr[border_mask(regions)] = 0
 
+    return _scaled_half_bgr(bgr, w, h)
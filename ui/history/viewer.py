@@ -1,25 +1,189 @@
 import os
 import json
+import threading
+import numpy as np
 from PyQt6.QtWidgets import (
     QGraphicsView, QGraphicsScene, QGraphicsPixmapItem
 )
-from PyQt6.QtGui import QPixmap, QWheelEvent, QPainter
+from PyQt6.QtGui import QImage, QPixmap, QWheelEvent, QPainter
 from PyQt6.QtCore import Qt, QRectF, pyqtSignal
 
-from .utils import file_hash
-from .renderer import generate_colored_map_half, generate_province_id_map
-from .highlighter import generate_highlight_half_from_idmap
+from map.map_registry import cached_file_hash
+from .renderer import generate_base_map_half, generate_province_id_map
+from .highlighter import ProvinceSpanIndex, generate_highlight_half_for_province
+from .pixmap_cache import PixmapLRUCache, pixmap_nbytes
+from ui.ui_settings_qt import load_settings
+
+
+# Subir al cambiar el formato de province_id_map.npy
+PROVINCE_ID_CACHE_VERSION = 1
+
+# Presupuesto por defecto de la caché de resaltados (settings.json → highlight_cache_mb)
+DEFAULT_HIGHLIGHT_CACHE_MB = 64
+
+
+def _tmp_path(path):
+    # Único por hilo: las vistas base y mod pueden escribir la caché a la vez
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+# ============================================================
+# Capas pesadas del mapa (sin QPixmap: se pueden preparar fuera del hilo GUI)
+# ============================================================
+class MapLayers:
+    """
+    province_id_map, índice de tramos e imagen base HALF de un mapa.
+    check_cancelled se llama entre etapas; puede lanzar una excepción para abortar.
+    """
+
+    def __init__(self, image_path, map_loader, check_cancelled=None):
+        self.image_path = image_path
+        self.map_loader = map_loader
+        self.check_cancelled = check_cancelled or (lambda: None)
+
+        # provinces.png ya decodificado por MapLoader
+        self.raster = map_loader.raster
+        self.w = self.raster.width
+        self.h = self.raster.height
+
+        self.cache_dir = os.path.join(os.path.dirname(image_path), "ck3_map_cache")
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.h_provinces = cached_file_hash(self.image_path)
+        self.h_def = cached_file_hash(self.map_loader.definition_path)
+        self.check_cancelled()
+
+        self.province_id_map = self.load_or_build_province_id_map()
+        self.check_cancelled()
+
+        # bbox + tramos por provincia: el resaltado solo toca su rectángulo
+        self.province_index = ProvinceSpanIndex(self.province_id_map, self.w, self.h)
+        self.check_cancelled()
+
+        self.base_image = self.generate_or_load_cached_map()
+
+        # Solo hacía falta al construir; compartidas, no deben retener al worker
+        self.check_cancelled = lambda: None
+
+    def load_or_build_province_id_map(self):
+        cache_npy = os.path.join(self.cache_dir, "province_id_map.npy")
+        cache_meta = os.path.join(self.cache_dir, "province_id_map.meta")
+
+        if os.path.isfile(cache_npy) and os.path.isfile(cache_meta):
+            try:
+                meta = json.load(open(cache_meta, "r", encoding="utf-8"))
+                if (
+                    meta.get("cache_version") == PROVINCE_ID_CACHE_VERSION
+                    and meta.get("provinces_hash") == self.h_provinces
+                    and meta.get("definition_hash") == self.h_def
+                ):
+                    # mmap: solo se leen del disco las páginas que se usan
+                    province_id_map = np.load(cache_npy, mmap_mode="r")
+                    if province_id_map.shape == (self.w * self.h,):
+                        return province_id_map
+            except Exception:
+                pass
+
+        province_id_map = generate_province_id_map(self.raster, self.map_loader)
+
+        # Escritura atómica: otra vista puede tener mapeado el fichero anterior
+        tmp_npy = _tmp_path(cache_npy)
+        try:
+            if os.path.isfile(cache_meta):
+                os.remove(cache_meta)
+
+            with open(tmp_npy, "wb") as f:
+                np.save(f, province_id_map)
+            os.replace(tmp_npy, cache_npy)
+
+            json.dump(
+                {
+                    "cache_version": PROVINCE_ID_CACHE_VERSION,
+                    "provinces_hash": self.h_provinces,
+                    "definition_hash": self.h_def,
+                    "dtype": province_id_map.dtype.name,
+                    "width": self.w,
+                    "height": self.h,
+                },
+                open(cache_meta, "w", encoding="utf-8"),
+                indent=2,
+            )
+        except OSError:
+            # En Windows no se puede reemplazar un fichero mapeado; seguimos sin caché
+            if os.path.isfile(tmp_npy):
+                os.remove(tmp_npy)
+
+        return province_id_map
+
+    def generate_or_load_cached_map(self):
+        cache_png = os.path.join(self.cache_dir, "base_map_half.png")
+        cache_meta = os.path.join(self.cache_dir, "base_map_half.meta")
+
+        h_provinces = self.h_provinces
+        h_def = self.h_def
+        h_map = cached_file_hash(self.map_loader.default_map_path)
+
+        if os.path.isfile(cache_png) and os.path.isfile(cache_meta):
+            try:
+                meta = json.load(open(cache_meta, "r", encoding="utf-8"))
+                if (
+                    meta.get("provinces_hash") == h_provinces
+                    and meta.get("definition_hash") == h_def
+                    and meta.get("default_map_hash") == h_map
+                ):
+                    qimg_half = QImage(cache_png)
+                    if not qimg_half.isNull():
+                        return qimg_half
+            except Exception:
+                pass
+
+        qimg_half = generate_base_map_half(
+            self.raster,
+            self.map_loader.lut,
+            self.province_id_map
+        )
+
+        tmp_png = _tmp_path(cache_png)
+        try:
+            if os.path.isfile(cache_meta):
+                os.remove(cache_meta)
+
+            if qimg_half.save(tmp_png, "PNG"):
+                os.replace(tmp_png, cache_png)
+
+                json.dump(
+                    {
+                        "provinces_hash": h_provinces,
+                        "definition_hash": h_def,
+                        "default_map_hash": h_map,
+                    },
+                    open(cache_meta, "w", encoding="utf-8"),
+                    indent=2,
+                )
+        except OSError:
+            if os.path.isfile(tmp_png):
+                os.remove(tmp_png)
+
+        return qimg_half
 
 
 class MapViewerQt(QGraphicsView):
-    province_clicked = pyqtSignal(dict)
+    province_clicked = pyqtSignal(object)    # ProvinceView
 
-    def __init__(self, image_path, map_loader):
+    def __init__(self, image_path, map_loader, layers=None):
         super().__init__()
 
         self.map_loader = map_loader
         self.image_path = image_path
 
+        # Sin capas precalculadas se generan aquí (modo síncrono)
+        if layers is None:
+            layers = MapLayers(image_path, map_loader)
+
+        # El registro solo guarda referencias débiles: mientras el viewer
+        # viva, las capas siguen disponibles para la otra vista y las recargas
+        self.layers = layers
+
         self.scene = QGraphicsScene(self)
         self.setScene(self.scene)
 
@@ -29,14 +193,15 @@ class MapViewerQt(QGraphicsView):
         self.setCursor(Qt.CursorShape.ArrowCursor)
         self.setDragMode(QGraphicsView.DragMode.NoDrag)
 
-        self.pixmap = QPixmap(image_path)
-        self.original_img = self.pixmap.toImage()
-        self.w = self.original_img.width()
-        self.h = self.original_img.height()
+        self.raster = layers.raster
+        self.w = layers.w
+        self.h = layers.h
 
-        self.province_id_map = generate_province_id_map(self.original_img, self.map_loader)
+        self.province_id_map = layers.province_id_map
+        self.province_index = layers.province_index
 
-        self.highlight_cache = {}
+        cache_mb = load_settings().get("highlight_cache_mb", DEFAULT_HIGHLIGHT_CACHE_MB)
+        self.highlight_cache = PixmapLRUCache(cache_mb * 1024 * 1024)
 
         self.colored_layer = QGraphicsPixmapItem()
         self.colored_layer.setZValue(10)
@@ -46,7 +211,7 @@ class MapViewerQt(QGraphicsView):
         self.highlight_layer.setZValue(30)
         self.scene.addItem(self.highlight_layer)
 
-        self.generate_or_load_cached_map()
+        self.colored_layer.setPixmap(QPixmap.fromImage(layers.base_image))
 
         half_w = self.colored_layer.pixmap().width()
         half_h = self.colored_layer.pixmap().height()
@@ -69,52 +234,6 @@ class MapViewerQt(QGraphicsView):
             self.fit_to_window()
             self.base_scale = self.transform().m11()
 
-    def generate_or_load_cached_map(self):
-        base_dir = os.path.dirname(self.image_path)
-        cache_dir = os.path.join(base_dir, "ck3_map_cache")
-        os.makedirs(cache_dir, exist_ok=True)
-
-        cache_png = os.path.join(cache_dir, "base_map_half.png")
-        cache_meta = os.path.join(cache_dir, "base_map_half.meta")
-
-        h_provinces = file_hash(self.image_path)
-        h_def = file_hash(self.map_loader.definition_path)
-        h_map = file_hash(self.map_loader.default_map_path)
-
-        if os.path.isfile(cache_png) and os.path.isfile(cache_meta):
-            try:
-                meta = json.load(open(cache_meta, "r", encoding="utf-8"))
-                if (
-                    meta.get("provinces_hash") == h_provinces
-                    and meta.get("definition_hash") == h_def
-                    and meta.get("default_map_hash") == h_map
-                ):
-                    self.colored_layer.setPixmap(QPixmap(cache_png))
-                    return
-            except Exception:
-                pass
-
-        from .renderer import generate_base_map_half
-
-        qimg_half = generate_base_map_half(
-            self.original_img,
-            self.map_loader.lut,
-            self.province_id_map
-        )
-        qimg_half.save(cache_png)
-
-        json.dump(
-            {
-                "provinces_hash": h_provinces,
-                "definition_hash": h_def,
-                "default_map_hash": h_map,
-            },
-            open(cache_meta, "w", encoding="utf-8"),
-            indent=2,
-        )
-
-        self.colored_layer.setPixmap(QPixmap.fromImage(qimg_half))
-
     def fit_to_window(self):
         self.resetTransform()
         self.fitInView(self.scene.sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
@@ -122,20 +241,24 @@ class MapViewerQt(QGraphicsView):
     def highlight_province(self, province):
         pid = province["id"]
 
-        if pid in self.highlight_cache:
-            self.highlight_layer.setPixmap(self.highlight_cache[pid])
+        cached = self.highlight_cache.get(pid)
+        if cached is not None:
+            pix, (x, y) = cached
+            self.highlight_layer.setPixmap(pix)
+            self.highlight_layer.setOffset(x, y)
             return
 
-        img = generate_highlight_half_from_idmap(
-            self.province_id_map,
-            self.w,
-            self.h,
-            pid
-        )
+        result = generate_highlight_half_for_province(self.province_index, pid)
+        if result is None:
+            self.highlight_layer.setPixmap(QPixmap())
+            return
+
+        img, (x, y) = result
 
         pix = QPixmap.fromImage(img)
-        self.highlight_cache[pid] = pix
+        self.highlight_cache.put(pid, (pix, (x, y)), pixmap_nbytes(pix))
         self.highlight_layer.setPixmap(pix)
+        self.highlight_layer.setOffset(x, y)
 
     def wheelEvent(self, event: QWheelEvent):
         if event.angleDelta().y() > 0:
@@ -179,7 +302,7 @@ class MapViewerQt(QGraphicsView):
 
             if 0 <= x < self.w and 0 <= y < self.h:
                 idx = y * self.w + x
-                province_id = self.province_id_map[idx]
+                province_id = int(self.province_id_map[idx])
 
                 if province_id > 0:
                     province = self.map_loader.get_province_from_id(province_id)
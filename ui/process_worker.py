@@ -0,0 +1,76 @@
+import time
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from core.processor import process_modules, estimate_modules
+
+
+class ProcessSignals(QObject):
+    progress = pyqtSignal(int, int, str)    # hechos, total, archivo
+    finished = pyqtSignal(object)           # registro "summary" del log
+    failed = pyqtSignal(str)                # error
+
+
+# ---------------------------------------------------------
+# Procesado de fechas en un hilo del QThreadPool
+# ---------------------------------------------------------
+class ProcessWorker(QRunnable):
+    """
+    Ejecuta process_modules fuera del hilo de la GUI.
+    kwargs se pasan tal cual a process_modules; cancel() para entre archivos.
+    El progreso se emite como mucho cada PROGRESS_INTERVAL segundos para no
+    saturar la cola de eventos con miles de archivos pequeños.
+    """
+
+    PROGRESS_INTERVAL = 0.1
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.kwargs = kwargs
+
+        self.signals = ProcessSignals()
+        self._cancelled = threading.Event()
+        self._last_emit = 0.0
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def on_progress(self, done, total, rel):
+        now = time.monotonic()
+        if done == total or now - self._last_emit >= self.PROGRESS_INTERVAL:
+            self._last_emit = now
+            self.signals.progress.emit(done, total, rel)
+
+    def run(self):
+        try:
+            summary = process_modules(
+                progress=self.on_progress,
+                cancel=self._cancelled,
+                **self.kwargs
+            )
+            self.signals.finished.emit(summary)
+
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
+# ---------------------------------------------------------
+# Estimación (dry-run) en un hilo del QThreadPool
+# ---------------------------------------------------------
+class EstimateWorker(QRunnable):
+    """
+    Ejecuta estimate_modules fuera del hilo de la GUI: recorre y lee todos
+    los archivos seleccionados. kwargs se pasan tal cual a estimate_modules.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.kwargs = kwargs
+        self.signals = ProcessSignals()
+
+    def run(self):
+        try:
+            self.signals.finished.emit(estimate_modules(**self.kwargs))
+        except Exception as e:
+            self.signals.failed.emit(str(e))
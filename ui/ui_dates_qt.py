@@ -1,11 +1,17 @@
 from PyQt6.QtWidgets import (
     QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout,
-    QTabWidget, QScrollArea, QGridLayout, QCheckBox, QMessageBox
+    QTabWidget, QScrollArea, QGridLayout, QCheckBox, QMessageBox,
+    QTreeWidget, QTreeWidgetItem, QProgressBar
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThreadPool
 
-from core.processor import process_module
+import os
+import time
+
+from core.process_log import list_runs, runs_path, read_run_summary
+from ui.process_worker import ProcessWorker, EstimateWorker
 from core.defines import read_end_date, read_mod_end_date, write_end_date
+from ui.ui_settings_qt import load_settings
 
 
 class DatesTabQt(QWidget):
@@ -14,6 +20,9 @@ class DatesTabQt(QWidget):
         self.app = app
 
         self.module_vars = {}
+        self.worker = None          # ProcessWorker en curso
+        self.estimate_worker = None # EstimateWorker en curso
+        self.process_started = 0.0
 
         self.build_ui()
 
@@ -74,17 +83,115 @@ class DatesTabQt(QWidget):
         self.modules_layout = QGridLayout(self.modules_container)
         scroll.setWidget(self.modules_container)
 
-        # Botón procesar
-        btn_process = QPushButton("Procesar")
-        btn_process.clicked.connect(self.run_processing)
-        layout.addWidget(btn_process)
+        # Reprocesar también lo que el manifiesto da por actualizado
+        self.chk_force = QCheckBox("Forzar reprocesado completo (ignorar manifiesto)")
+        layout.addWidget(self.chk_force)
+
+        # Botones estimar / procesar
+        buttons = QHBoxLayout()
+        layout.addLayout(buttons)
+
+        self.btn_estimate = QPushButton("Estimar (sin escribir)")
+        self.btn_estimate.clicked.connect(self.run_estimate)
+        buttons.addWidget(self.btn_estimate)
+
+        self.btn_process = QPushButton("Procesar")
+        self.btn_process.clicked.connect(self.run_processing)
+        buttons.addWidget(self.btn_process)
+
+        self.btn_cancel = QPushButton("Cancelar")
+        self.btn_cancel.clicked.connect(self.cancel_processing)
+        self.btn_cancel.setEnabled(False)
+        buttons.addWidget(self.btn_cancel)
+
+        # Progreso del procesado (archivo actual y tiempo restante)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+
+        self.label_progress = QLabel("")
+        self.label_progress.setStyleSheet("color: gray;")
+        layout.addWidget(self.label_progress)
+
+        # Resultado de la estimación
+        self.label_estimate = QLabel("")
+        layout.addWidget(self.label_estimate)
+
+        self.tree_estimate = QTreeWidget()
+        self.tree_estimate.setHeaderLabels([
+            "Módulo", "Archivos", "Cambian", "Sin fechas", "Copiados",
+            "Omitidos", "Fechas", "MB a escribir", "Backup a copiar"
+        ])
+        self.tree_estimate.setColumnWidth(0, 260)
+        self.tree_estimate.setVisible(False)
+        layout.addWidget(self.tree_estimate)
 
     # ---------------------------------------------------------
     # SUBPESTAÑA: LOGS
     # ---------------------------------------------------------
     def build_logs_tab(self):
         layout = QVBoxLayout(self.tab_logs)
-        layout.addWidget(QLabel("Los logs se guardan en logs/<perfil>/<modulo>.log"))
+        layout.addWidget(QLabel("Los logs se guardan en logs/<perfil>/runs/<fecha>.jsonl (uno por ejecución)"))
+
+        # Una fila por ejecución; los módulos cuelgan de ella
+        self.tree_runs = QTreeWidget()
+        self.tree_runs.setHeaderLabels([
+            "Ejecución", "Archivos", "Cambian", "Sin fechas", "Copiados",
+            "Omitidos", "Fechas", "MB leídos", "MB escritos", "Backup copiados", "Segundos"
+        ])
+        self.tree_runs.setColumnWidth(0, 260)
+        layout.addWidget(self.tree_runs)
+
+        btn_reload = QPushButton("Recargar logs")
+        btn_reload.clicked.connect(self.load_run_logs)
+        layout.addWidget(btn_reload)
+
+    # ---------------------------------------------------------
+    # LOGS: totales de cada ejecución (registro "summary")
+    # ---------------------------------------------------------
+    def load_run_logs(self):
+        self.tree_runs.clear()
+
+        profile = self.app.current_profile
+        if not profile:
+            return
+
+        folder = runs_path(profile["name"])
+
+        for name in list_runs(profile["name"]):
+            summary = read_run_summary(os.path.join(folder, name))
+            if summary is None:
+                self.tree_runs.addTopLevelItem(QTreeWidgetItem([f"{name} (incompleto)"]))
+                continue
+
+            label = summary["finished"].replace("T", " ")
+            if not summary.get("completed", True):
+                label += " (interrumpido)"
+
+            item = QTreeWidgetItem(self.summary_columns(label, summary))
+            item.setText(10, f"{summary['seconds']:.1f}")
+
+            for module_name, totals in summary["modules"].items():
+                item.addChild(QTreeWidgetItem(self.summary_columns(module_name, totals)))
+            for module_name in summary.get("missing", []):
+                item.addChild(QTreeWidgetItem([f"{module_name} (no existe en el juego)"]))
+
+            self.tree_runs.addTopLevelItem(item)
+
+    def summary_columns(self, label, totals):
+        return [
+            label,
+            str(totals["files"]),
+            str(totals["changed"]),
+            str(totals["no_dates"]),
+            str(totals["copied"]),
+            str(totals["skipped"]),
+            str(totals["changes"]),
+            f"{totals['bytes_in'] / 1e6:.1f}",
+            f"{totals['bytes_out'] / 1e6:.1f}",
+            str(totals["backup_copied"]),
+            "",
+        ]
 
     # ---------------------------------------------------------
     # REFRESH
@@ -117,6 +224,9 @@ class DatesTabQt(QWidget):
         # Módulos
         self.load_modules_for_process()
 
+        # Logs de ejecuciones anteriores
+        self.load_run_logs()
+
     # ---------------------------------------------------------
     # MÓDULOS PARA PROCESADO
     # ---------------------------------------------------------
@@ -154,6 +264,100 @@ class DatesTabQt(QWidget):
                 col = 0
                 row += 1
 
+    # ---------------------------------------------------------
+    # ESTIMACIÓN (dry-run: no escribe nada)
+    # ---------------------------------------------------------
+    def run_estimate(self):
+        profile = self.app.current_profile
+        if not profile:
+            QMessageBox.critical(self, "Error", "Selecciona un perfil")
+            return
+
+        try:
+            offset = int(self.entry_offset.text())
+        except ValueError:
+            QMessageBox.critical(self, "Error", "Offset inválido")
+            return
+
+        selected = [name for name, chk in self.module_vars.items() if chk.isChecked()]
+        settings = load_settings()
+
+        # Lee todos los archivos seleccionados: fuera del hilo de la GUI
+        worker = EstimateWorker(
+            game_key=profile["game"],
+            module_names=selected,
+            game_root=profile["game_root"],
+            mod_root=profile["mod_root"],
+            backup_root=profile["backup_root"],
+            offset=offset,
+            profile_name=profile["name"],
+            workers=settings.get("process_workers", 0),
+            incremental=not self.chk_force.isChecked(),
+            verify_backup=settings.get("backup_verify_content", False),
+            stream_threshold=settings.get("stream_threshold_mb", 32) * 1024 * 1024,
+            modules=self.app.modules
+        )
+        worker.signals.finished.connect(self.on_estimate_finished)
+        worker.signals.failed.connect(self.on_estimate_failed)
+        self.estimate_worker = worker
+
+        self.set_estimating(True)
+        QThreadPool.globalInstance().start(worker)
+
+    def set_estimating(self, running):
+        self.btn_estimate.setEnabled(not running)
+        self.btn_process.setEnabled(not running)
+        if running:
+            self.tree_estimate.clear()
+            self.label_estimate.setText("Estimando… (se leen todos los archivos seleccionados)")
+
+    def on_estimate_finished(self, result):
+        self.estimate_worker = None
+        self.set_estimating(False)
+        self.show_estimate(result)
+
+    def on_estimate_failed(self, error):
+        self.estimate_worker = None
+        self.set_estimating(False)
+        self.label_estimate.setText("")
+        QMessageBox.critical(self, "Error", f"Error en la estimación:\n{error}")
+
+    def show_estimate(self, result):
+        self.tree_estimate.clear()
+
+        for module_name, totals in result["modules"].items():
+            self.tree_estimate.addTopLevelItem(QTreeWidgetItem(self.estimate_columns(module_name, totals)))
+        for module_name in result["missing"]:
+            self.tree_estimate.addTopLevelItem(QTreeWidgetItem([f"{module_name} (no existe en el juego)"]))
+
+        self.tree_estimate.setVisible(True)
+
+        totals = result["totals"]
+        if result["from_history"]:
+            eta = f"Tiempo estimado: {result['estimated_seconds']:.0f} s (según la última ejecución)."
+        else:
+            # Sin historial solo se sabe lo que tardó leer: el procesado escribe además
+            eta = f"Tiempo mínimo: {result['estimated_seconds']:.0f} s (solo el escaneo; aún no hay ejecuciones)."
+        self.label_estimate.setText(
+            f"Cambian {totals['changed']} de {totals['files']} archivos "
+            f"({totals['changes']} fechas), se escribirían "
+            f"{totals['bytes_out'] / 1e6:.1f} MB en el mod y se copiarían "
+            f"{totals['backup_copied']} archivos al backup. {eta}"
+        )
+
+    def estimate_columns(self, label, totals):
+        return [
+            label,
+            str(totals["files"]),
+            str(totals["changed"]),
+            str(totals["no_dates"]),
+            str(totals["copied"]),
+            str(totals["skipped"]),
+            str(totals["changes"]),
+            f"{totals['bytes_out'] / 1e6:.1f}",
+            str(totals["backup_copied"]),
+        ]
+
     # ---------------------------------------------------------
     # PROCESADO
     # ---------------------------------------------------------
@@ -180,19 +384,86 @@ class DatesTabQt(QWidget):
         game_key = profile["game"]
         profile_name = profile["name"]
 
-        for module_name, chk in self.module_vars.items():
-            if chk.isChecked():
-                process_module(
-                    game_key,
-                    module_name,
-                    game_root,
-                    mod_root,
-                    backup_root,
-                    offset,
-                    profile_name
-                )
-
-        QMessageBox.information(self, "OK", "Procesado completado")
+        selected = [name for name, chk in self.module_vars.items() if chk.isChecked()]
+
+        settings = load_settings()
+
+        worker = ProcessWorker(
+            game_key=game_key,
+            module_names=selected,
+            game_root=game_root,
+            mod_root=mod_root,
+            backup_root=backup_root,
+            offset=offset,
+            profile_name=profile_name,
+            # 0 → un proceso por núcleo
+            workers=settings.get("process_workers", 0),
+            incremental=not self.chk_force.isChecked(),
+            verify_backup=settings.get("backup_verify_content", False),
+            stream_threshold=settings.get("stream_threshold_mb", 32) * 1024 * 1024,
+            modules=self.app.modules
+        )
+        worker.signals.progress.connect(self.on_process_progress)
+        worker.signals.finished.connect(self.on_process_finished)
+        worker.signals.failed.connect(self.on_process_failed)
+        self.worker = worker
+
+        self.set_processing(True)
+        self.process_started = time.monotonic()
+
+        QThreadPool.globalInstance().start(worker)
+
+    # ---------------------------------------------------------
+    # PROCESADO EN SEGUNDO PLANO
+    # ---------------------------------------------------------
+    def set_processing(self, running):
+        self.btn_process.setEnabled(not running)
+        self.btn_estimate.setEnabled(not running)
+        self.btn_cancel.setEnabled(running)
+
+        if running:
+            self.progress_bar.setRange(0, 0)
+            self.progress_bar.show()
+            self.label_progress.setText("Preparando…")
+        else:
+            self.progress_bar.hide()
+            self.label_progress.setText("")
+
+    def cancel_processing(self):
+        if self.worker:
+            self.worker.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.label_progress.setText("Cancelando… (se termina el archivo en curso)")
+
+    def on_process_progress(self, done, total, rel):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+
+        # ETA lineal por archivos
+        elapsed = time.monotonic() - self.process_started
+        remaining = elapsed / done * (total - done) if done else 0
+        self.label_progress.setText(
+            f"{done}/{total} · {rel} · quedan ~{int(remaining) // 60}:{int(remaining) % 60:02d}"
+        )
+
+    def on_process_finished(self, summary):
+        self.worker = None
+        self.set_processing(False)
+        self.load_run_logs()
+
+        if summary.get("cancelled"):
+            QMessageBox.information(
+                self, "Cancelado",
+                f"Procesado cancelado tras {summary['files']} archivos"
+            )
+        else:
+            QMessageBox.information(self, "OK", "Procesado completado")
+
+    def on_process_failed(self, error):
+        self.worker = None
+        self.set_processing(False)
+        self.load_run_logs()
+        QMessageBox.critical(self, "Error", f"Error en el procesado:\n{error}")
 
     # ---------------------------------------------------------
     # END_DATE
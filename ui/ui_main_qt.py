@@ -1,8 +1,7 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QTabWidget, QVBoxLayout
 )
-from PyQt6.QtCore import Qt
-import json
+from PyQt6.QtCore import Qt, QObject, pyqtSignal
 
 # Pestañas Qt
 from ui.ui_profile_qt import ProfileTabQt
@@ -15,7 +14,12 @@ from ui.ui_validation_qt import ValidationTabQt
 
 # Datos
 from utils.profile_ops import load_profiles
-from core.processor import load_modules
+from core.config import modules_config, files_config
+
+
+class ConfigSignals(QObject):
+    modules_changed = pyqtSignal(object)
+    files_changed = pyqtSignal(object)
 
 
 class ModToolAppQt(QMainWindow):
@@ -34,10 +38,8 @@ class ModToolAppQt(QMainWindow):
 
         # Datos globales
         self.profiles = load_profiles()
-        self.modules = load_modules()
-
-        with open("data/files.json", "r", encoding="utf-8") as f:
-            self.files = json.load(f)
+        self.modules = modules_config.get()
+        self.files = files_config.get()
 
         self.current_profile = self.profiles[0] if self.profiles else None
 
@@ -87,6 +89,27 @@ class ModToolAppQt(QMainWindow):
         self.settings_tab = SettingsTabQt(self)
         self.tabs.addTab(self.settings_tab, "Opciones")
 
+        # Pestañas que se refrescan al cambiar de perfil, pero solo cuando
+        # se muestran por primera vez después del cambio (dirty flag)
+        self.lazy_tabs = [
+            self.history_tab_base,
+            self.history_tab_mod,
+            self.dates_tab,
+            self.modules_tab,
+            self.validation_tab,
+        ]
+        self.dirty_tabs = set()
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+
+        # Cambios en modules.json / files.json (desde la app o en disco).
+        # Pasan por señales: si el aviso llega desde un worker (p. ej. el
+        # procesado relee modules.json) se entrega en el hilo de la GUI
+        self.config_signals = ConfigSignals()
+        self.config_signals.modules_changed.connect(self.on_modules_changed)
+        self.config_signals.files_changed.connect(self.on_files_changed)
+        modules_config.subscribe(self.config_signals.modules_changed.emit)
+        files_config.subscribe(self.config_signals.files_changed.emit)
+
         # Aplicar tema inicial
         self.apply_theme(self.theme)
 
@@ -105,12 +128,39 @@ class ModToolAppQt(QMainWindow):
         self.current_profile = profile
 
         self.profile_tab.refresh()
-        self.history_tab_base.refresh()
-        self.history_tab_mod.refresh()
-        self.dates_tab.refresh()
-        self.modules_tab.refresh()
-        self.validation_tab.refresh()
-        # logs no necesita refresh
+
+        # El resto se marca como pendiente y se refresca al mostrarse
+        # (logs no necesita refresh)
+        self.dirty_tabs = set(self.lazy_tabs)
+        self.refresh_tab_if_dirty(self.tabs.currentWidget())
+
+    # ---------------------------------------------------------
+    # Cuando cambia la configuración de módulos / archivos
+    # ---------------------------------------------------------
+    # La pestaña que hace el cambio ya se refresca sola; el resto se marca
+    # como pendiente y se refresca al mostrarse
+    def on_modules_changed(self, modules):
+        self.modules = modules
+        self.mark_tabs_dirty([self.dates_tab, self.modules_tab, self.validation_tab])
+
+    def on_files_changed(self, files):
+        self.files = files
+        self.mark_tabs_dirty([self.validation_tab])
+
+    def mark_tabs_dirty(self, tabs):
+        current = self.tabs.currentWidget()
+        self.dirty_tabs.update(tab for tab in tabs if tab is not current)
+
+    # ---------------------------------------------------------
+    # Refresco diferido de pestañas
+    # ---------------------------------------------------------
+    def on_tab_changed(self, index):
+        self.refresh_tab_if_dirty(self.tabs.widget(index))
+
+    def refresh_tab_if_dirty(self, tab):
+        if tab in self.dirty_tabs:
+            self.dirty_tabs.discard(tab)
+            tab.refresh()
 
     # ---------------------------------------------------------
     # Temas
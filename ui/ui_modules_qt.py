@@ -2,7 +2,7 @@ from PyQt6.QtWidgets import (
     QWidget, QLabel, QLineEdit, QPushButton, QListWidget,
     QVBoxLayout, QHBoxLayout, QMessageBox
 )
-import json
+from core.config import modules_config
 
 
 class ModulesTabQt(QWidget):
@@ -186,5 +186,11 @@ class ModulesTabQt(QWidget):
     # Guardar modules.json
     # ---------------------------------------------------------
     def save_modules_file(self):
-        with open("data/modules.json", "w", encoding="utf-8") as f:
-            json.dump(self.app.modules, f, indent=4)
+        # Avisa a la ventana principal: el resto de pestañas se refrescan
+        # sin volver a leer el archivo
+        try:
+            modules_config.save(self.app.modules)
+        except OSError as e:
+            # Sin guardar: se descartan los cambios en memoria
+            self.app.modules = modules_config.get()
+            QMessageBox.critical(self, "Error", f"No se pudo guardar modules.json:\n{e}")
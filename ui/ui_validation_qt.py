@@ -1,31 +1,24 @@
 import os
-import json
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
-    QTreeWidget, QTreeWidgetItem, QTextEdit, QTabWidget, QMessageBox
+    QTreeWidget, QTreeWidgetItem, QTextEdit, QTabWidget, QMessageBox,
+    QProgressBar
 )
 from PyQt6.QtGui import QColor, QTextCharFormat, QTextCursor
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThreadPool
 
+from core.config import files_config
 from core.validation import (
     collect_module_files,
-    compare_file_contents
+    TreeIndex,
+    files_equal,
+    validate_modules_full,
+    validate_files_full,
+    DiffCache
 )
-
-
-def list_files_recursive(base_path):
-    result = []
-    if not os.path.isdir(base_path):
-        return result
-
-    for root, dirs, files in os.walk(base_path):
-        for f in files:
-            full = os.path.join(root, f)
-            rel = os.path.relpath(full, base_path)
-            result.append(rel.replace("\\", "/"))
-
-    return result
+from ui.validation_worker import ValidationWorker
+from ui.ui_settings_qt import load_settings
 
 
 class ValidationTabQt(QWidget):
@@ -33,12 +26,20 @@ class ValidationTabQt(QWidget):
         super().__init__()
         self.app = app
 
-        # Para detalles de validación total
+        # Para detalles de validación total (solo pares de rutas: los diffs
+        # se calculan al abrirlos)
         self.module_full_results = []   # (module_name, estado_mod, estado_game, detalles_mod, detalles_game)
-        self.file_full_results = []     # (file_key, estado_mod, diff_mod, estado_game, diff_game)
+        self.file_full_results = []     # (file_key, estado_mod, pair_mod, estado_game, pair_game)
 
-        # Para diff puntual
-        self.current_diff_lines = None
+        # Para diff puntual: (ruta izquierda, ruta derecha) o None
+        self.current_diff_pair = None
+
+        # Diffs abiertos recientemente
+        self.diff_cache = DiffCache()
+
+        # Validación total en curso: (ValidationWorker, botón, cancelar, progreso)
+        self.worker = None
+        self.worker_widgets = None
 
         self.build_ui()
 
@@ -102,11 +103,10 @@ class ValidationTabQt(QWidget):
         layout.addWidget(btn_run)
 
         self.tree_mod_single = QTreeWidget()
-        self.tree_mod_single.setColumnCount(3)
-        self.tree_mod_single.setHeaderLabels(["Estado", "Archivo", "diff"])
+        self.tree_mod_single.setColumnCount(2)
+        self.tree_mod_single.setHeaderLabels(["Estado", "Archivo"])
         self.tree_mod_single.setColumnWidth(0, 120)
         self.tree_mod_single.setColumnWidth(1, 500)
-        self.tree_mod_single.setColumnHidden(2, True)
         layout.addWidget(self.tree_mod_single)
 
         self.tree_mod_single.itemDoubleClicked.connect(self.open_diff_from_item)
@@ -117,9 +117,21 @@ class ValidationTabQt(QWidget):
 
         layout.addWidget(QLabel("Validación total de módulos"))
 
-        btn_run = QPushButton("Validar todos los módulos")
-        btn_run.clicked.connect(self.run_validation_module_full)
-        layout.addWidget(btn_run)
+        buttons = QHBoxLayout()
+        layout.addLayout(buttons)
+
+        self.btn_mod_full_run = QPushButton("Validar todos los módulos")
+        self.btn_mod_full_run.clicked.connect(self.run_validation_module_full)
+        buttons.addWidget(self.btn_mod_full_run)
+
+        self.btn_mod_full_cancel = QPushButton("Cancelar")
+        self.btn_mod_full_cancel.clicked.connect(self.cancel_validation)
+        self.btn_mod_full_cancel.setEnabled(False)
+        buttons.addWidget(self.btn_mod_full_cancel)
+
+        self.progress_mod_full = QProgressBar()
+        self.progress_mod_full.hide()
+        layout.addWidget(self.progress_mod_full)
 
         self.tree_mod_full = QTreeWidget()
         self.tree_mod_full.setColumnCount(3)
@@ -220,9 +232,21 @@ class ValidationTabQt(QWidget):
 
         layout.addWidget(QLabel("Validación total de archivos"))
 
-        btn_run = QPushButton("Validar todos los archivos")
-        btn_run.clicked.connect(self.run_validation_file_full)
-        layout.addWidget(btn_run)
+        buttons = QHBoxLayout()
+        layout.addLayout(buttons)
+
+        self.btn_file_full_run = QPushButton("Validar todos los archivos")
+        self.btn_file_full_run.clicked.connect(self.run_validation_file_full)
+        buttons.addWidget(self.btn_file_full_run)
+
+        self.btn_file_full_cancel = QPushButton("Cancelar")
+        self.btn_file_full_cancel.clicked.connect(self.cancel_validation)
+        self.btn_file_full_cancel.setEnabled(False)
+        buttons.addWidget(self.btn_file_full_cancel)
+
+        self.progress_file_full = QProgressBar()
+        self.progress_file_full.hide()
+        layout.addWidget(self.progress_file_full)
 
         self.tree_file_full = QTreeWidget()
         self.tree_file_full.setColumnCount(3)
@@ -238,6 +262,10 @@ class ValidationTabQt(QWidget):
     # REFRESH (llamado desde ui_main_qt)
     # =========================================================
     def refresh(self):
+        # Los resultados de una validación anterior ya no valen
+        self.cancel_validation()
+        self.stop_validation()
+
         profile = self.app.current_profile
         if not profile:
             self.combo_modules.clear()
@@ -256,7 +284,8 @@ class ValidationTabQt(QWidget):
         self.combo_files.addItems(sorted(game_files.keys()))
 
         self.label_result.setText("")
-        self.current_diff_lines = None
+        self.current_diff_pair = None
+        self.diff_cache.clear()
 
         self.tree_mod_single.clear()
         self.tree_mod_full.clear()
@@ -269,7 +298,6 @@ class ValidationTabQt(QWidget):
     # =========================================================
     def run_validation_module_single(self):
         self.tree_mod_single.clear()
-        self.current_diff_lines = None
 
         profile = self.app.current_profile
         if not profile:
@@ -302,8 +330,10 @@ class ValidationTabQt(QWidget):
             QMessageBox.critical(self, "Error", "Configura rutas de juego, mod y backup en el perfil")
             return
 
-        game_files, backup_files = collect_module_files(game_root, backup_root, rel_path)
-        mod_files, _ = collect_module_files(mod_root, mod_root, rel_path)
+        # El mod se recorre una sola vez (el segundo diccionario sale del índice)
+        index = TreeIndex()
+        game_files, backup_files = collect_module_files(game_root, backup_root, rel_path, index)
+        mod_files, _ = collect_module_files(mod_root, mod_root, rel_path, index)
 
         if comparison == "Juego ↔ Mod":
             left = game_files
@@ -326,133 +356,69 @@ class ValidationTabQt(QWidget):
             r = right.get(rel)
 
             if l and r:
-                same, diff_lines = compare_file_contents(l, r)
-                if same:
+                if files_equal(l, r):
                     continue
                 estado = "Modificado"
+                pair = (l, r)
             elif l and not r:
                 estado = "Eliminado"
-                diff_lines = None
+                pair = None
             else:
                 estado = "Añadido"
-                diff_lines = None
+                pair = None
+
+            self.tree_mod_single.addTopLevelItem(self.make_status_item(estado, rel, pair))
 
-            item = QTreeWidgetItem([estado, rel, json.dumps(diff_lines)])
-            if estado == "Modificado":
-                item.setForeground(0, QColor("#d17b00"))
-            elif estado == "Añadido":
-                item.setForeground(0, QColor("green"))
-            elif estado == "Eliminado":
-                item.setForeground(0, QColor("red"))
+    # ---------------------------------------------------------
+    # Fila Estado / Archivo; el par de rutas va en UserRole
+    # ---------------------------------------------------------
+    def make_status_item(self, estado, rel, pair):
+        item = QTreeWidgetItem([estado, rel])
+        item.setData(0, Qt.ItemDataRole.UserRole, pair)
 
-            self.tree_mod_single.addTopLevelItem(item)
+        if estado == "Modificado":
+            item.setForeground(0, QColor("#d17b00"))
+        elif estado == "Añadido":
+            item.setForeground(0, QColor("green"))
+        elif estado == "Eliminado":
+            item.setForeground(0, QColor("red"))
+
+        return item
 
     # =========================================================
     # LÓGICA: MÓDULOS (todos)
     # =========================================================
     def run_validation_module_full(self):
         profile = self.app.current_profile
-        if not profile:
+        if not profile or self.worker:
             return
 
         game_key = profile["game"]
-        game_modules = self.app.modules.get(game_key, {})
-
-        active_modules = profile["modules"]
 
         self.module_full_results = []
         self.tree_mod_full.clear()
 
-        for module_name in active_modules:
-            if module_name not in game_modules:
-                continue
-
-            cfg = game_modules[module_name]
-            rel = cfg["path"]
-            ignore_ext = cfg.get("ignore_ext", [])
-
-            game_dir = os.path.join(profile["game_root"], rel)
-            mod_dir = os.path.join(profile["mod_root"], rel)
-            backup_dir = os.path.join(profile["backup_root"], rel)
-
-            files_mod = list_files_recursive(mod_dir)
-            files_game = list_files_recursive(game_dir)
-            files_backup = list_files_recursive(backup_dir)
-
-            all_files = sorted(set(files_mod + files_game + files_backup))
-
-            detalles_mod = []
-            detalles_game = []
-
-            mod_equal = mod_changed = mod_only = backup_only_mod = 0
-            game_equal = game_changed = game_only = backup_only_game = 0
+        self.start_validation(
+            validate_modules_full,
+            self.on_module_full_result,
+            (self.btn_mod_full_run, self.btn_mod_full_cancel, self.progress_mod_full),
+            game_root=profile["game_root"],
+            mod_root=profile["mod_root"],
+            backup_root=profile["backup_root"],
+            game_modules=self.app.modules.get(game_key, {}),
+            module_names=profile["modules"],
+            profile_name=profile["name"]
+        )
+
+    def on_module_full_result(self, result):
+        if not self.is_current_worker():
+            return
 
-            for f in all_files:
-                ext = os.path.splitext(f)[1].lower()
-                if ext in ignore_ext:
-                    continue
+        module_name, estado_mod, estado_game, detalles_mod, detalles_game = result
+        self.module_full_results.append(result)
 
-                mod_path = os.path.join(mod_dir, f)
-                game_path = os.path.join(game_dir, f)
-                backup_path = os.path.join(backup_dir, f)
-
-                # MOD ↔ BACKUP
-                if not os.path.isfile(mod_path):
-                    if os.path.isfile(backup_path):
-                        detalles_mod.append((f, "Eliminado", None))
-                        backup_only_mod += 1
-                elif not os.path.isfile(backup_path):
-                    detalles_mod.append((f, "Añadido", None))
-                    mod_only += 1
-                else:
-                    same, diff = compare_file_contents(mod_path, backup_path)
-                    if same:
-                        mod_equal += 1
-                    else:
-                        detalles_mod.append((f, "Modificado", diff))
-                        mod_changed += 1
-
-                # JUEGO ↔ BACKUP
-                if not os.path.isfile(game_path):
-                    if os.path.isfile(backup_path):
-                        detalles_game.append((f, "Eliminado", None))
-                        backup_only_game += 1
-                elif not os.path.isfile(backup_path):
-                    detalles_game.append((f, "Añadido", None))
-                    game_only += 1
-                else:
-                    same, diff = compare_file_contents(game_path, backup_path)
-                    if same:
-                        game_equal += 1
-                    else:
-                        detalles_game.append((f, "Modificado", diff))
-                        game_changed += 1
-
-            total_mod = mod_equal + mod_changed + mod_only + backup_only_mod
-            total_game = game_equal + game_changed + game_only + backup_only_game
-
-            estado_mod = (
-                f"{total_mod} archivos — "
-                f"{mod_changed} modificados, "
-                f"{mod_equal} iguales, "
-                f"{mod_only} añadidos, "
-                f"{backup_only_mod} eliminados"
-            )
-
-            estado_game = (
-                f"{total_game} archivos — "
-                f"{game_changed} modificados, "
-                f"{game_equal} iguales, "
-                f"{game_only} añadidos, "
-                f"{backup_only_game} eliminados"
-            )
-
-            self.module_full_results.append(
-                (module_name, estado_mod, estado_game, detalles_mod, detalles_game)
-            )
-
-            item = QTreeWidgetItem([module_name, estado_mod, estado_game])
-            self.tree_mod_full.addTopLevelItem(item)
+        item = QTreeWidgetItem([module_name, estado_mod, estado_game])
+        self.tree_mod_full.addTopLevelItem(item)
 
     def show_module_full_details(self):
         sel = self.tree_mod_full.selectedItems()
@@ -484,23 +450,15 @@ class ValidationTabQt(QWidget):
         l_mod = QVBoxLayout(w_mod)
 
         tree_mod = QTreeWidget()
-        tree_mod.setColumnCount(3)
-        tree_mod.setHeaderLabels(["Estado", "Archivo", "diff"])
+        tree_mod.setColumnCount(2)
+        tree_mod.setHeaderLabels(["Estado", "Archivo"])
         tree_mod.setColumnWidth(0, 120)
         tree_mod.setColumnWidth(1, 500)
-        tree_mod.setColumnHidden(2, True)
         l_mod.addWidget(tree_mod)
 
-        for f, estado, diff in detalles_mod:
+        for f, estado, pair in detalles_mod:
             if estado in ("Modificado", "Añadido", "Eliminado"):
-                item = QTreeWidgetItem([estado, f, json.dumps(diff)])
-                if estado == "Modificado":
-                    item.setForeground(0, QColor("#d17b00"))
-                elif estado == "Añadido":
-                    item.setForeground(0, QColor("green"))
-                elif estado == "Eliminado":
-                    item.setForeground(0, QColor("red"))
-                tree_mod.addTopLevelItem(item)
+                tree_mod.addTopLevelItem(self.make_status_item(estado, f, pair))
 
         tree_mod.itemDoubleClicked.connect(self.open_diff_from_item)
 
@@ -510,23 +468,15 @@ class ValidationTabQt(QWidget):
         l_game = QVBoxLayout(w_game)
 
         tree_game = QTreeWidget()
-        tree_game.setColumnCount(3)
-        tree_game.setHeaderLabels(["Estado", "Archivo", "diff"])
+        tree_game.setColumnCount(2)
+        tree_game.setHeaderLabels(["Estado", "Archivo"])
         tree_game.setColumnWidth(0, 120)
         tree_game.setColumnWidth(1, 500)
-        tree_game.setColumnHidden(2, True)
         l_game.addWidget(tree_game)
 
-        for f, estado, diff in detalles_game:
+        for f, estado, pair in detalles_game:
             if estado in ("Modificado", "Añadido", "Eliminado"):
-                item = QTreeWidgetItem([estado, f, json.dumps(diff)])
-                if estado == "Modificado":
-                    item.setForeground(0, QColor("#d17b00"))
-                elif estado == "Añadido":
-                    item.setForeground(0, QColor("green"))
-                elif estado == "Eliminado":
-                    item.setForeground(0, QColor("red"))
-                tree_game.addTopLevelItem(item)
+                tree_game.addTopLevelItem(self.make_status_item(estado, f, pair))
 
         tree_game.itemDoubleClicked.connect(self.open_diff_from_item)
 
@@ -572,32 +522,31 @@ class ValidationTabQt(QWidget):
         if not os.path.isfile(left_path):
             self.label_result.setText(f"[+] SOLO EN {left_label} — {rel_display}")
             self.label_result.setStyleSheet("color: blue;")
-            self.current_diff_lines = None
+            self.current_diff_pair = None
             return
 
         if not os.path.isfile(backup_path):
             self.label_result.setText(f"[-] SOLO EN BACKUP — {rel_game}")
             self.label_result.setStyleSheet("color: purple;")
-            self.current_diff_lines = None
+            self.current_diff_pair = None
             return
 
-        same, diff = compare_file_contents(left_path, backup_path)
-
-        if same:
+        if files_equal(left_path, backup_path):
             self.label_result.setText(f"[=] IGUAL — {rel_display}")
             self.label_result.setStyleSheet("color: green;")
-            self.current_diff_lines = None
+            self.current_diff_pair = None
         else:
             self.label_result.setText(f"[!] CAMBIADO — {rel_display}")
             self.label_result.setStyleSheet("color: red;")
-            self.current_diff_lines = diff
+            self.current_diff_pair = (left_path, backup_path)
 
     def show_current_diff(self):
-        if not self.current_diff_lines:
+        diff = self.diff_for_pair(self.current_diff_pair)
+        if not diff:
             QMessageBox.information(self, "Info", "No hay diff disponible")
             return
 
-        self.show_diff_dialog(self.current_diff_lines, "Diff del archivo")
+        self.show_diff_dialog(diff, "Diff del archivo")
 
     # ---------------------------------------------------------
     # Añadir archivo
@@ -617,9 +566,8 @@ class ValidationTabQt(QWidget):
 
         rel = os.path.relpath(path, game_root).replace("\\", "/")
 
-        # Cargar files.json
-        with open("data/files.json", "r", encoding="utf-8") as f:
-            files_data = json.load(f)
+        # files.json (copia de la caché; se relee solo si cambió en disco)
+        files_data = files_config.get()
 
         game_key = profile["game"]
         if game_key not in files_data:
@@ -634,11 +582,12 @@ class ValidationTabQt(QWidget):
 
         files_data[game_key][name] = {"path": rel}
 
-        # Guardar
-        with open("data/files.json", "w", encoding="utf-8") as f:
-            json.dump(files_data, f, indent=4)
-
-        self.app.files = files_data
+        # Guardar (avisa a la ventana principal, que actualiza app.files)
+        try:
+            files_config.save(files_data)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar files.json:\n{e}")
+            return
 
         # Activar en el perfil
         profile["files"].append(name)
@@ -723,18 +672,18 @@ class ValidationTabQt(QWidget):
         def save():
             new_path = entry.text().strip()
 
-            with open("data/files.json", "r", encoding="utf-8") as f:
-                files_data = json.load(f)
+            files_data = files_config.get()
 
             if new_path:
                 files_data[game_key][sel]["map_to"] = new_path
             else:
                 files_data[game_key][sel].pop("map_to", None)
 
-            with open("data/files.json", "w", encoding="utf-8") as f:
-                json.dump(files_data, f, indent=4)
-
-            self.app.files = files_data
+            try:
+                files_config.save(files_data)
+            except OSError as e:
+                QMessageBox.critical(dlg, "Error", f"No se pudo guardar files.json:\n{e}")
+                return
             dlg.accept()
 
         btn = QPushButton("Guardar")
@@ -749,57 +698,35 @@ class ValidationTabQt(QWidget):
     # =========================================================
     def run_validation_file_full(self):
         profile = self.app.current_profile
-        if not profile:
+        if not profile or self.worker:
             return
 
         game_key = profile["game"]
-        game_files = self.app.files.get(game_key, {})
-
-        active_files = profile["files"]
 
         self.file_full_results = []
         self.tree_file_full.clear()
 
-        for file_key in active_files:
-            if file_key not in game_files:
-                continue
-
-            data = game_files[file_key]
-
-            rel_game = data["path"]
-            rel_mod = data.get("map_to", rel_game)
-
-            game_path = os.path.join(profile["game_root"], rel_game)
-            mod_path = os.path.join(profile["mod_root"], rel_mod)
-            backup_path = os.path.join(profile["backup_root"], rel_game)
-
-
-            # MOD ↔ BACKUP
-            if not os.path.isfile(mod_path):
-                estado_mod = "[+] Solo en JUEGO"
-                diff_mod = None
-            elif not os.path.isfile(backup_path):
-                estado_mod = "[-] Solo en BACKUP"
-                diff_mod = None
-            else:
-                same, diff_mod = compare_file_contents(mod_path, backup_path)
-                estado_mod = "[=] Igual" if same else "[!] Cambiado"
-
-            # JUEGO ↔ BACKUP
-            if not os.path.isfile(game_path):
-                estado_game = "[+] Solo en MOD"
-                diff_game = None
-            elif not os.path.isfile(backup_path):
-                estado_game = "[-] Solo en BACKUP"
-                diff_game = None
-            else:
-                same, diff_game = compare_file_contents(game_path, backup_path)
-                estado_game = "[=] Igual" if same else "[!] Cambiado"
+        self.start_validation(
+            validate_files_full,
+            self.on_file_full_result,
+            (self.btn_file_full_run, self.btn_file_full_cancel, self.progress_file_full),
+            game_root=profile["game_root"],
+            mod_root=profile["mod_root"],
+            backup_root=profile["backup_root"],
+            game_files=self.app.files.get(game_key, {}),
+            file_keys=profile["files"],
+            profile_name=profile["name"]
+        )
+
+    def on_file_full_result(self, result):
+        if not self.is_current_worker():
+            return
 
-            self.file_full_results.append((file_key, estado_mod, diff_mod, estado_game, diff_game))
+        file_key, estado_mod, pair_mod, estado_game, pair_game = result
+        self.file_full_results.append(result)
 
-            item = QTreeWidgetItem([file_key, estado_mod, estado_game])
-            self.tree_file_full.addTopLevelItem(item)
+        item = QTreeWidgetItem([file_key, estado_mod, estado_game])
+        self.tree_file_full.addTopLevelItem(item)
 
     def show_file_full_diff(self):
         sel = self.tree_file_full.selectedItems()
@@ -809,27 +736,107 @@ class ValidationTabQt(QWidget):
 
         file_key = sel[0].text(0)
 
-        for name, estado_mod, diff_mod, estado_game, diff_game in self.file_full_results:
+        for name, estado_mod, pair_mod, estado_game, pair_game in self.file_full_results:
             if name == file_key:
-                self.show_file_diff_choice_dialog(file_key, diff_mod, diff_game)
+                self.show_file_diff_choice_dialog(file_key, pair_mod, pair_game)
                 return
 
+    # =========================================================
+    # VALIDACIÓN TOTAL EN SEGUNDO PLANO
+    # =========================================================
+    def start_validation(self, validate, on_result, widgets, **kwargs):
+        settings = load_settings()
+
+        worker = ValidationWorker(
+            validate,
+            # 0 → un proceso por núcleo para las comparaciones de texto
+            cpu_workers=settings.get("process_workers", 0),
+            # Los pares tocados hace poco no se dan por buenos desde la caché
+            verify_content=settings.get("backup_verify_content", False),
+            **kwargs
+        )
+        worker.signals.result.connect(on_result)
+        worker.signals.progress.connect(self.on_validation_progress)
+        worker.signals.finished.connect(self.on_validation_finished)
+        worker.signals.failed.connect(self.on_validation_failed)
+
+        self.worker = worker
+        self.worker_widgets = widgets
+
+        btn_run, btn_cancel, progress_bar = widgets
+        self.btn_mod_full_run.setEnabled(False)
+        self.btn_file_full_run.setEnabled(False)
+        btn_cancel.setEnabled(True)
+        progress_bar.setRange(0, 0)
+        progress_bar.show()
+
+        QThreadPool.globalInstance().start(worker)
+
+    def is_current_worker(self):
+        # Señales pendientes de una validación ya cancelada se ignoran
+        return self.worker is not None and self.sender() is self.worker.signals
+
+    def stop_validation(self):
+        if self.worker_widgets:
+            btn_run, btn_cancel, progress_bar = self.worker_widgets
+            btn_cancel.setEnabled(False)
+            progress_bar.hide()
+
+        self.btn_mod_full_run.setEnabled(True)
+        self.btn_file_full_run.setEnabled(True)
+
+        self.worker = None
+        self.worker_widgets = None
+
+    def cancel_validation(self):
+        if self.worker:
+            self.worker.cancel()
+            self.worker_widgets[1].setEnabled(False)
+
+    def on_validation_progress(self, done, total):
+        if not self.is_current_worker():
+            return
+
+        progress_bar = self.worker_widgets[2]
+        progress_bar.setRange(0, total)
+        progress_bar.setValue(done)
+
+    def on_validation_finished(self, cancelled):
+        if not self.is_current_worker():
+            return
+
+        self.stop_validation()
+        if cancelled:
+            QMessageBox.information(self, "Cancelado", "Validación cancelada")
+
+    def on_validation_failed(self, error):
+        if not self.is_current_worker():
+            return
+
+        self.stop_validation()
+        QMessageBox.critical(self, "Error", f"Error en la validación:\n{error}")
+
     # =========================================================
     # DIFFS
     # =========================================================
+    def diff_for_pair(self, pair):
+        """
+        Diff de (izquierda, derecha) calculado al abrirlo, con caché LRU.
+        [] si no hay par o los archivos ya no difieren.
+        """
+        if not pair:
+            return []
+        return self.diff_cache.get(*pair)
+
     def open_diff_from_item(self, item, column):
-        diff_raw = item.text(2)
+        pair = item.data(0, Qt.ItemDataRole.UserRole)
         file_name = item.text(1)
 
-        if not diff_raw or diff_raw == "None":
+        diff = self.diff_for_pair(pair)
+        if not diff:
             QMessageBox.information(self, "Info", "Este archivo no tiene diferencias")
             return
 
-        try:
-            diff = json.loads(diff_raw)
-        except Exception:
-            diff = diff_raw.split("\n")
-
         self.show_diff_dialog(diff, f"Diferencias — {file_name}")
 
     def show_diff_dialog(self, diff_lines, title):
@@ -938,7 +945,7 @@ class ValidationTabQt(QWidget):
 
 
 
-    def show_file_diff_choice_dialog(self, file_key, diff_mod, diff_game):
+    def show_file_diff_choice_dialog(self, file_key, pair_mod, pair_game):
         from PyQt6.QtWidgets import QDialog
 
         dlg = QDialog(self)
@@ -951,12 +958,14 @@ class ValidationTabQt(QWidget):
         btn_game = QPushButton("Juego ↔ Backup")
 
         def open_mod():
+            diff_mod = self.diff_for_pair(pair_mod)
             if not diff_mod:
                 QMessageBox.information(dlg, "Info", "No hay diff disponible")
                 return
             self.show_diff_dialog(diff_mod, f"MOD ↔ Backup — {file_key}")
 
         def open_game():
+            diff_game = self.diff_for_pair(pair_game)
             if not diff_game:
                 QMessageBox.information(dlg, "Info", "No hay diff disponible")
                 return
@@ -0,0 +1,60 @@
+import time
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from core.validation import ValidationCancelled
+
+
+class ValidationSignals(QObject):
+    progress = pyqtSignal(int, int)     # hechos, total
+    result = pyqtSignal(object)         # un módulo o un archivo ya clasificado
+    finished = pyqtSignal(bool)         # True si se canceló
+    failed = pyqtSignal(str)            # error
+
+
+# ---------------------------------------------------------
+# Validación total en un hilo del QThreadPool
+# ---------------------------------------------------------
+class ValidationWorker(QRunnable):
+    """
+    Recorre un generador de core.validation (validate_modules_full o
+    validate_files_full) fuera del hilo de la GUI y emite cada resultado
+    en cuanto está listo. kwargs se pasan tal cual al generador.
+    """
+
+    PROGRESS_INTERVAL = 0.1
+
+    def __init__(self, validate, **kwargs):
+        super().__init__()
+        self.validate = validate
+        self.kwargs = kwargs
+
+        self.signals = ValidationSignals()
+        self._cancelled = threading.Event()
+        self._last_emit = 0.0
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def on_progress(self, done, total):
+        now = time.monotonic()
+        if done == total or now - self._last_emit >= self.PROGRESS_INTERVAL:
+            self._last_emit = now
+            self.signals.progress.emit(done, total)
+
+    def run(self):
+        try:
+            for result in self.validate(
+                progress=self.on_progress,
+                cancel=self._cancelled,
+                **self.kwargs
+            ):
+                self.signals.result.emit(result)
+            self.signals.finished.emit(False)
+
+        except ValidationCancelled:
+            self.signals.finished.emit(True)
+
+        except Exception as e:
+            self.signals.failed.emit(str(e))
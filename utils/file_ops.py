@@ -1,5 +1,6 @@
 import os
 import shutil
+import filecmp
 
 
 # ---------------------------------------------------------
@@ -24,6 +25,59 @@ def copy_file(src, dst):
     shutil.copy2(src, dst)
 
 
+# ---------------------------------------------------------
+# ¿dst ya es una copia idéntica de src?
+# ---------------------------------------------------------
+# FAT/exFAT guardan el mtime con resolución de 2 s y muchos recursos SMB
+# lo redondean: dentro de este margen se considera el mismo mtime
+MTIME_TOLERANCE_NS = 2_000_000_000
+
+
+def same_mtime(st_a, st_b):
+    return abs(st_a.st_mtime_ns - st_b.st_mtime_ns) < MTIME_TOLERANCE_NS
+
+
+def files_match(src, dst, verify_content=False):
+    """
+    - Mismo tamaño y mtime (copy2 conserva el mtime, con el margen de
+      MTIME_TOLERANCE_NS) → iguales
+    - verify_content=True: si solo difiere el mtime, se comparan los bytes
+    """
+    try:
+        st_dst = os.stat(dst)
+    except OSError:
+        return False
+
+    st_src = os.stat(src)
+
+    if st_src.st_size != st_dst.st_size:
+        return False
+    if same_mtime(st_src, st_dst):
+        return True
+
+    return verify_content and filecmp.cmp(src, dst, shallow=False)
+
+
+# ---------------------------------------------------------
+# Copiar solo si el destino no es ya idéntico
+# ---------------------------------------------------------
+def copy_if_changed(src, dst, verify_content=False):
+    """
+    Copia src → dst con copy2 salvo que dst ya sea idéntico (files_match).
+    Si el contenido coincidía pero el mtime no, se sincronizan los metadatos
+    en lugar de copiar.
+    Devuelve True si se copió, False si se omitió.
+    """
+    if files_match(src, dst, verify_content):
+        if not same_mtime(os.stat(src), os.stat(dst)):
+            shutil.copystat(src, dst)
+        return False
+
+    ensure_dir(os.path.dirname(dst))
+    shutil.copy2(src, dst)
+    return True
+
+
 # ---------------------------------------------------------
 # Leer archivo con fallback de codificación
 # ---------------------------------------------------------
@@ -40,6 +94,25 @@ def read_text_file(path):
             return f.read()
 
 
+# ---------------------------------------------------------
+# Decodificar bytes ya leídos con fallback
+# ---------------------------------------------------------
+def decode_text(data):
+    """
+    Decodifica bytes intentando UTF-8 y luego Latin-1.
+    Normaliza los saltos de línea igual que open() en modo texto.
+    """
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        text = data.decode("latin-1")
+
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    return text
+
+
 # ---------------------------------------------------------
 # Leer archivo línea a línea con fallback
 # ---------------------------------------------------------
@@ -67,6 +140,25 @@ def write_text_file(path, content):
         f.write(content)
 
 
+# ---------------------------------------------------------
+# Escribir bytes de forma atómica (temporal + rename)
+# ---------------------------------------------------------
+def write_bytes_atomic(path, data):
+    """
+    Escribe data en un temporal junto a path y lo renombra encima.
+    Un corte a mitad nunca deja path escrito a medias.
+    """
+    ensure_dir(os.path.dirname(path))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
 # ---------------------------------------------------------
 # Comprobar si un archivo existe
 # ---------------------------------------------------------